@@ -8,6 +8,17 @@ from datetime import datetime
 from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 from pathlib import Path
+from speaker_scoring import SpeakerContextIndex, DEFAULT_CONTEXT_WINDOW
+from batch_corrections import find_all_instances
+from transcript_model import load_compact_transcript
+from transcript_stream import HEADER_FIELDS, iter_sentences
+from training_export import DEFAULT_EXPORT_WINDOW, iter_context_records, reviewed_text_changes
+from video_cache import create_video_cache
+from jobs import JobManager
+from suggestion_engine import SuggestionEngine
+from progress_rollup import ProgressRollup
+from review_queries import ItemIndex
+from request_profiling import list_profiles, profile_artifact_path, profile_summary, profiled
 
 app = Flask(__name__)
 CORS(app)
@@ -32,6 +43,15 @@ KNOWN_TRANSITION_PHRASES = [
 # Maximum time gap (seconds) to consider for automatic merge suggestion
 MAX_MERGE_GAP_SECONDS = 2.0
 
+# Optional local disk cache for videos on the network share (set VIDEO_CACHE_DIR to enable)
+video_cache = create_video_cache()
+
+# Bounded pool for long-running library operations (see /api/jobs)
+job_manager = JobManager()
+
+# Review progress totals across the library (see /api/progress)
+progress_rollup = ProgressRollup(BASE_DIR)
+
 
 def parse_speaker_names(md_content):
     """Parse speaker names section from markdown."""
@@ -68,7 +88,7 @@ def parse_corrections_markdown(md_content):
     # Line 14: "check, queen suited" → ??? ✓/✗
     # Line 49: "Ace-King" → "AK" (all instances) ✓/✗
     correction_pattern = re.compile(
-        r'Line (\d+): "(.+?)" → (\?\?\?|"(.+?)")(?:\s*\([^)]+\))?\s*(✓/✗|✓|✗|\[skipped\])(?:\s*→\s*"(.+?)")?'
+        r'Line (\d+): "(.+?)" → (\?\?\?|"(.+?)")(?:\s*\(([^)]+)\))?\s*(✓/✗|✓|✗|\[skipped\])(?:\s*→\s*"(.+?)")?'
     )
 
     for line in lines:
@@ -106,8 +126,12 @@ def parse_corrections_markdown(md_content):
                 else:
                     suggested = corr_match.group(4)  # The content inside quotes
 
-                status_marker = corr_match.group(5)
-                custom_text = corr_match.group(6)
+                # "(all instances)" annotation widens the correction to the whole transcript
+                annotation = corr_match.group(5)
+                scope = "all_instances" if annotation and annotation.strip().lower() == "all instances" else "single"
+
+                status_marker = corr_match.group(6)
+                custom_text = corr_match.group(7)
 
                 # Determine status
                 status = "pending"
@@ -136,20 +160,145 @@ def parse_corrections_markdown(md_content):
                     "suggested": suggested,
                     "status": status,
                     "final": final,
-                    "correction_type": "unclear" if suggested is None else "standard"
+                    "correction_type": "unclear" if suggested is None else "standard",
+                    "scope": scope
                 })
 
     return corrections
 
 
-def detect_unknown_speakers(transcript):
+def build_speaker_suggestion(sentences, i, context_index, context_window=DEFAULT_CONTEXT_WINDOW):
+    """
+    Build the merge suggestion for the UNKNOWN sentence at position i.
+
+    Args:
+        sentences: Transcript sentences (speaker fields reflect current assignments)
+        i: Position of the UNKNOWN sentence
+        context_index: SpeakerContextIndex built over the same sentences
+        context_window: Number of sentences on each side used for candidate scoring
+    """
+    sentence = sentences[i]
+    speaker = sentence.get('speaker', '')
+
+    # Get context: previous and next sentences
+    prev_sentence = sentences[i - 1] if i > 0 else None
+    next_sentence = sentences[i + 1] if i < len(sentences) - 1 else None
+
+    # Analyze for merge suggestion
+    suggestion_type = "needs_review"
+    confidence = 0.0
+    reason = ""
+
+    text = sentence.get('text', '')
+    start_time = sentence.get('start', 0)
+    end_time = sentence.get('end', 0)
+
+    # Check for known transition phrases
+    text_lower = text.lower()
+    has_transition_phrase = any(
+        phrase.lower() in text_lower
+        for phrase in KNOWN_TRANSITION_PHRASES
+    )
+
+    # Analyze time gaps
+    gap_before = start_time - prev_sentence.get('end', 0) if prev_sentence else float('inf')
+    gap_after = next_sentence.get('start', float('inf')) - end_time if next_sentence else float('inf')
+
+    # Get neighboring speakers
+    prev_speaker = prev_sentence.get('speaker', '') if prev_sentence else None
+    next_speaker = next_sentence.get('speaker', '') if next_sentence else None
+
+    # Decision logic
+    if has_transition_phrase:
+        # Transition phrases often indicate the main speaker
+        if prev_speaker and prev_speaker == next_speaker:
+            suggestion_type = "merge_before"
+            confidence = 0.9
+            reason = f"Transition phrase detected, surrounding speaker is {prev_speaker}"
+        elif prev_speaker:
+            suggestion_type = "merge_before"
+            confidence = 0.7
+            reason = f"Transition phrase detected, likely continues from {prev_speaker}"
+        else:
+            suggestion_type = "needs_review"
+            confidence = 0.5
+            reason = "Transition phrase detected but context unclear"
+
+    elif gap_before < MAX_MERGE_GAP_SECONDS and prev_speaker:
+        # Very close to previous sentence - likely same speaker
+        if gap_after > MAX_MERGE_GAP_SECONDS or not next_speaker:
+            suggestion_type = "merge_before"
+            confidence = 0.8
+            reason = f"Small gap ({gap_before:.1f}s) from {prev_speaker}"
+        elif prev_speaker == next_speaker:
+            suggestion_type = "merge_before"
+            confidence = 0.85
+            reason = f"Sandwiched between {prev_speaker} segments"
+        else:
+            suggestion_type = "needs_review"
+            confidence = 0.5
+            reason = f"Between different speakers: {prev_speaker} and {next_speaker}"
+
+    elif gap_after < MAX_MERGE_GAP_SECONDS and next_speaker:
+        suggestion_type = "merge_after"
+        confidence = 0.7
+        reason = f"Small gap ({gap_after:.1f}s) to {next_speaker}"
+
+    else:
+        # Check segment length - very short segments are often interjections
+        duration = end_time - start_time
+        if duration < 2.0:
+            suggestion_type = "needs_review"
+            confidence = 0.3
+            reason = f"Short segment ({duration:.1f}s), possibly interjection"
+        else:
+            suggestion_type = "keep_separate"
+            confidence = 0.4
+            reason = "Distinct segment, may be separate speaker"
+
+    # Windowed context: nearest known speakers and ranked candidates
+    known_prev, known_gap_before, known_next, known_gap_after = context_index.nearest_known(i)
+    candidate_speakers = context_index.score(i, context_window)
+
+    return {
+        "id": i,
+        "sentence_id": sentence.get('id', i),
+        "text": text,
+        "start": start_time,
+        "end": end_time,
+        "current_speaker": speaker,
+        "prev_speaker": prev_speaker,
+        "next_speaker": next_speaker,
+        "gap_before": round(gap_before, 2) if gap_before != float('inf') else None,
+        "gap_after": round(gap_after, 2) if gap_after != float('inf') else None,
+        "suggestion_type": suggestion_type,
+        "confidence": confidence,
+        "reason": reason,
+        "has_transition_phrase": has_transition_phrase,
+        "nearest_known_before": known_prev,
+        "nearest_known_after": known_next,
+        "known_gap_before": round(known_gap_before, 2) if known_gap_before is not None else None,
+        "known_gap_after": round(known_gap_after, 2) if known_gap_after is not None else None,
+        "candidate_speakers": candidate_speakers,
+        "status": "pending",
+        "decision": None,
+        "assigned_speaker": None
+    }
+
+
+def detect_unknown_speakers(transcript, context_window=DEFAULT_CONTEXT_WINDOW):
     """
     Detect UNKNOWN speaker segments and generate merge suggestions.
 
+    Each suggestion also carries ranked candidate speakers scored over
+    `context_window` sentences on each side, so runs of consecutive UNKNOWN
+    segments still point at the nearest known speakers.
+
     Returns a list of unknown speaker suggestions with merge recommendations.
     """
     sentences = transcript.get('sentences', [])
     suggestions = []
+    context_index = SpeakerContextIndex(sentences)
 
     for i, sentence in enumerate(sentences):
         speaker = sentence.get('speaker', '')
@@ -161,109 +310,21 @@ def detect_unknown_speakers(transcript):
         if not is_unknown:
             continue
 
-        # Get context: previous and next sentences
-        prev_sentence = sentences[i - 1] if i > 0 else None
-        next_sentence = sentences[i + 1] if i < len(sentences) - 1 else None
-
-        # Analyze for merge suggestion
-        suggestion_type = "needs_review"
-        confidence = 0.0
-        reason = ""
-
-        text = sentence.get('text', '')
-        start_time = sentence.get('start', 0)
-        end_time = sentence.get('end', 0)
-
-        # Check for known transition phrases
-        text_lower = text.lower()
-        has_transition_phrase = any(
-            phrase.lower() in text_lower
-            for phrase in KNOWN_TRANSITION_PHRASES
-        )
-
-        # Analyze time gaps
-        gap_before = start_time - prev_sentence.get('end', 0) if prev_sentence else float('inf')
-        gap_after = next_sentence.get('start', float('inf')) - end_time if next_sentence else float('inf')
-
-        # Get neighboring speakers
-        prev_speaker = prev_sentence.get('speaker', '') if prev_sentence else None
-        next_speaker = next_sentence.get('speaker', '') if next_sentence else None
-
-        # Decision logic
-        if has_transition_phrase:
-            # Transition phrases often indicate the main speaker
-            if prev_speaker and prev_speaker == next_speaker:
-                suggestion_type = "merge_before"
-                confidence = 0.9
-                reason = f"Transition phrase detected, surrounding speaker is {prev_speaker}"
-            elif prev_speaker:
-                suggestion_type = "merge_before"
-                confidence = 0.7
-                reason = f"Transition phrase detected, likely continues from {prev_speaker}"
-            else:
-                suggestion_type = "needs_review"
-                confidence = 0.5
-                reason = "Transition phrase detected but context unclear"
-
-        elif gap_before < MAX_MERGE_GAP_SECONDS and prev_speaker:
-            # Very close to previous sentence - likely same speaker
-            if gap_after > MAX_MERGE_GAP_SECONDS or not next_speaker:
-                suggestion_type = "merge_before"
-                confidence = 0.8
-                reason = f"Small gap ({gap_before:.1f}s) from {prev_speaker}"
-            elif prev_speaker == next_speaker:
-                suggestion_type = "merge_before"
-                confidence = 0.85
-                reason = f"Sandwiched between {prev_speaker} segments"
-            else:
-                suggestion_type = "needs_review"
-                confidence = 0.5
-                reason = f"Between different speakers: {prev_speaker} and {next_speaker}"
-
-        elif gap_after < MAX_MERGE_GAP_SECONDS and next_speaker:
-            suggestion_type = "merge_after"
-            confidence = 0.7
-            reason = f"Small gap ({gap_after:.1f}s) to {next_speaker}"
-
-        else:
-            # Check segment length - very short segments are often interjections
-            duration = end_time - start_time
-            if duration < 2.0:
-                suggestion_type = "needs_review"
-                confidence = 0.3
-                reason = f"Short segment ({duration:.1f}s), possibly interjection"
-            else:
-                suggestion_type = "keep_separate"
-                confidence = 0.4
-                reason = "Distinct segment, may be separate speaker"
-
-        suggestions.append({
-            "id": i,
-            "sentence_id": sentence.get('id', i),
-            "text": text,
-            "start": start_time,
-            "end": end_time,
-            "current_speaker": speaker,
-            "prev_speaker": prev_speaker,
-            "next_speaker": next_speaker,
-            "gap_before": round(gap_before, 2) if gap_before != float('inf') else None,
-            "gap_after": round(gap_after, 2) if gap_after != float('inf') else None,
-            "suggestion_type": suggestion_type,
-            "confidence": confidence,
-            "reason": reason,
-            "has_transition_phrase": has_transition_phrase,
-            "status": "pending",
-            "decision": None,
-            "assigned_speaker": None
-        })
+        suggestions.append(build_speaker_suggestion(sentences, i, context_index, context_window))
 
     return suggestions
 
 
-def find_video_folders(base_path, max_depth=3):
-    """Find folders containing videos with correction markdown files (limited depth for speed)."""
+def find_video_folders(base_path, max_depth=3, progress=None):
+    """
+    Find folders containing videos with correction markdown files (limited depth for speed).
+
+    If given, progress(directories_scanned, videos_found, directory) is called
+    for every directory visited.
+    """
     results = []
     base = Path(base_path)
+    scanned = [0]
 
     if not base.exists():
         return results
@@ -272,6 +333,10 @@ def find_video_folders(base_path, max_depth=3):
         if depth > max_depth:
             return
 
+        scanned[0] += 1
+        if progress:
+            progress(scanned[0], len(results), directory)
+
         try:
             # Check for online_ai_suggested_edits in this directory
             edits_dir = directory / "online_ai_suggested_edits"
@@ -386,6 +451,10 @@ def serve_video():
             length = end - start + 1
 
             def generate():
+                if video_cache:
+                    yield from video_cache.iter_range(video_path, start, end)
+                    return
+
                 with open(video_path, 'rb') as f:
                     f.seek(start)
                     remaining = length
@@ -412,37 +481,167 @@ def serve_video():
     return send_file(video_path, mimetype='video/mp4')
 
 
-@app.route('/api/load', methods=['GET'])
-def load_video_data():
-    """Load video, corrections, and transcript data."""
-    video_path = request.args.get('video')
-
-    if not video_path:
-        return jsonify({"error": "Video path required"}), 400
+@app.route('/api/video-cache', methods=['GET'])
+def video_cache_stats():
+    """Report local video cache occupancy and hit ratio."""
+    if not video_cache:
+        return jsonify({"enabled": False})
+    return jsonify(video_cache.stats())
 
-    video_path = Path(video_path)
-    video_name = video_path.stem
-    video_dir = video_path.parent
 
-    # Check for reviewed file first (to resume), then fall back to original
+def find_corrections_path(video_dir, video_name):
+    """Find the corrections markdown for a video, preferring a reviewed copy to resume from."""
     reviewed_dir = video_dir / "selected_ai_edits"
     corrections_dir = video_dir / "online_ai_suggested_edits"
-    corrections_path = None
 
     # First, look for a reviewed file to resume from
     if reviewed_dir.exists():
         for f in reviewed_dir.glob(f"{video_name}_changelog*_reviewed.md"):
-            corrections_path = f
-            break
+            return f
 
     # If no reviewed file, load from original
-    if not corrections_path and corrections_dir.exists():
+    if corrections_dir.exists():
         for f in corrections_dir.glob(f"{video_name}_changelog*.md"):
-            corrections_path = f
-            break
+            return f
+
+    return corrections_dir / f"{video_name}_changelog.md"  # fallback for error message
+
+
+def resolve_correction_timestamps(corrections, sentences):
+    """
+    Point each correction's timestamp at the word being corrected, when it can be found.
+
+    Args:
+        corrections: Parsed corrections (updated in place)
+        sentences: Iterable of transcript sentences with original_sentences word lists;
+            only the corrected sentences need their words
+    """
+    # Build a map of sentence_id -> words with timing for finding correction timestamps
+    corrected_ids = set(c.get("sentence_id") for c in corrections)
+    sentence_words = {}
+    for i, s in enumerate(sentences):
+        sentence_id = s.get("id", i)
+        if sentence_id not in corrected_ids:
+            continue
+        sentence_words[sentence_id] = [
+            {
+                "word": w.get("word", "").lower().strip(".,!?;:'\""),
+                "start": w.get("start"),
+                "end": w.get("end")
+            }
+            for orig in s.get("original_sentences", [])
+            for w in orig.get("words", [])
+        ]
+
+    # Update correction timestamps to point to the specific word being corrected
+    for corr in corrections:
+        sentence_id = corr.get("sentence_id")
+        original = corr.get("original", "").lower()
+        words = sentence_words.get(sentence_id, [])
+
+        # Try to find the word(s) in the sentence
+        if words and original:
+            original_words = original.split()
+            first_word = original_words[0].strip(".,!?;:'\"") if original_words else ""
+
+            for w in words:
+                if first_word and first_word in w["word"]:
+                    if w["start"] is not None:
+                        corr["timestamp"] = w["start"]
+                    break
+
+
+# Parsed corrections keyed by corrections path; values carry the file versions they were built from
+_corrections_cache = {}
+
+
+def _collect_headers(sentences, headers):
+    """Pass sentences through, appending each one's header fields to headers."""
+    for s in sentences:
+        headers.append({k: v for k, v in s.items() if k != 'original_sentences'})
+        yield s
+
+
+def get_cached_corrections(corrections_path, transcript_path, headers=None):
+    """
+    Parse a corrections markdown file (with word-level timestamps), reusing the cached result.
+
+    Args:
+        corrections_path: Path to the corrections markdown
+        transcript_path: Path to the _v7.json transcript
+        headers: Optional list; when the transcript has to be read, every sentence's
+            HEADER_FIELDS are appended to it in the same pass, so /api/load does not
+            read the file twice
+
+    Returns:
+        Dict with corrections, speaker_names and a time-ordered ItemIndex
+    """
+    cache_key = str(corrections_path)
+    version = (os.path.getmtime(corrections_path), os.path.getmtime(transcript_path))
+
+    cached = _corrections_cache.get(cache_key)
+    if cached and cached["version"] == version:
+        return cached
+
+    with open(corrections_path, 'r', encoding='utf-8') as f:
+        corrections_md = f.read()
+    corrections = parse_corrections_markdown(corrections_md)
+    corrected_ids = set(c.get("sentence_id") for c in corrections)
+    if headers is None:
+        sentences = iter_sentences(transcript_path, ('id',), corrected_ids)
+    else:
+        sentences = _collect_headers(iter_sentences(transcript_path, HEADER_FIELDS, corrected_ids), headers)
+    resolve_correction_timestamps(corrections, sentences)
+
+    cached = {
+        "version": version,
+        "corrections": corrections,
+        "speaker_names": parse_speaker_names(corrections_md),
+        "index": ItemIndex(corrections, "timestamp", "id")
+    }
+    _corrections_cache[cache_key] = cached
+    return cached
+
+
+def valid_window(window):
+    """True if a context or export window from a request is a non-negative integer."""
+    return isinstance(window, int) and not isinstance(window, bool) and window >= 0
+
+
+# Incremental speaker suggestion state per loaded video (see /api/speaker-decision)
+_suggestion_engines = {}
+
+
+def create_suggestion_engine(video_path, sentences, reviewed=None, context_window=DEFAULT_CONTEXT_WINDOW):
+    """Build the incremental suggestion state for a video, replaying saved decisions and splits."""
+    # Saved decisions and splits are applied in bulk while the engine is built
+    decisions = reviewed.get('speaker_decisions') if reviewed else None
+    splits = reviewed.get('segment_splits') if reviewed else None
+    engine = SuggestionEngine(sentences, build_speaker_suggestion, context_window, decisions, splits)
+
+    _suggestion_engines[str(video_path)] = engine
+    return engine
+
+
+@app.route('/api/load', methods=['GET'])
+@profiled
+def load_video_data():
+    """Load video, corrections, and transcript data."""
+    video_path = request.args.get('video')
+    context_window = request.args.get('context_window', type=int, default=DEFAULT_CONTEXT_WINDOW)
+    lite = request.args.get('lite') == '1'
+
+    if not video_path:
+        return jsonify({"error": "Video path required"}), 400
 
-    if not corrections_path:
-        corrections_path = corrections_dir / f"{video_name}_changelog.md"  # fallback for error message
+    if not valid_window(context_window):
+        return jsonify({"error": "context_window must be a non-negative integer"}), 400
+
+    video_path = Path(video_path)
+    video_name = video_path.stem
+    video_dir = video_path.parent
+
+    corrections_path = find_corrections_path(video_dir, video_name)
     transcript_path = video_dir / "transcription_v7" / f"{video_name}_v7.json"
     reviewed_path = video_dir / "selected_ai_edits" / f"{video_name}_reviewed.json"
 
@@ -452,48 +651,19 @@ def load_video_data():
     if not transcript_path.exists():
         return jsonify({"error": f"Transcript file not found: {transcript_path}"}), 404
 
-    try:
-        # Load corrections
-        with open(corrections_path, 'r', encoding='utf-8') as f:
-            corrections_md = f.read()
-        corrections = parse_corrections_markdown(corrections_md)
+    # Start copying the video to the local cache while the reviewer works
+    if video_cache and video_path.exists():
+        video_cache.prefetch(str(video_path))
 
-        # Load transcript and simplify for frontend (reduce payload size)
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            full_transcript = json.load(f)
-
-        # Build a map of sentence_id -> words with timing for finding correction timestamps
-        sentence_words = {}
-        for i, s in enumerate(full_transcript.get("sentences", [])):
-            sentence_id = s.get("id", i)
-            words = []
-            for orig in s.get("original_sentences", []):
-                for w in orig.get("words", []):
-                    words.append({
-                        "word": w.get("word", "").lower().strip(".,!?;:'\""),
-                        "start": w.get("start"),
-                        "end": w.get("end")
-                    })
-            sentence_words[sentence_id] = words
-
-        # Update correction timestamps to point to the specific word being corrected
-        for corr in corrections:
-            sentence_id = corr.get("sentence_id")
-            original = corr.get("original", "").lower()
-            words = sentence_words.get(sentence_id, [])
-
-            # Try to find the word(s) in the sentence
-            if words and original:
-                original_words = original.split()
-                first_word = original_words[0].strip(".,!?;:'\"") if original_words else ""
-
-                for w in words:
-                    if first_word and first_word in w["word"]:
-                        if w["start"] is not None:
-                            corr["timestamp"] = w["start"]
-                        break
-
-        # Send simplified transcript - no word data to keep it lightweight
+    try:
+        # Load corrections (parsed once per file version, with word-level timestamps);
+        # on a cache miss the same transcript pass collects the sentence headers
+        headers = []
+        cached_corrections = get_cached_corrections(corrections_path, transcript_path, headers)
+        corrections = cached_corrections["corrections"]
+
+        # Send simplified transcript - no word data to keep it lightweight; the
+        # streaming reader skips the word arrays instead of parsing them
         transcript = {
             "sentences": [
                 {
@@ -504,7 +674,7 @@ def load_video_data():
                     "speaker": s.get("speaker", ""),
                     "was_unknown": s.get("was_unknown", False)
                 }
-                for i, s in enumerate(full_transcript.get("sentences", []))
+                for i, s in enumerate(headers or iter_sentences(transcript_path))
             ]
         }
 
@@ -514,18 +684,10 @@ def load_video_data():
             with open(reviewed_path, 'r', encoding='utf-8') as f:
                 reviewed = json.load(f)
 
-        # Detect UNKNOWN speaker segments and generate suggestions
-        unknown_speaker_suggestions = detect_unknown_speakers(transcript)
-
-        # If we have reviewed data with speaker decisions, merge them
-        if reviewed and reviewed.get('speaker_decisions'):
-            speaker_decisions = {d['sentence_id']: d for d in reviewed['speaker_decisions']}
-            for suggestion in unknown_speaker_suggestions:
-                if suggestion['sentence_id'] in speaker_decisions:
-                    decision = speaker_decisions[suggestion['sentence_id']]
-                    suggestion['status'] = decision.get('status', 'pending')
-                    suggestion['decision'] = decision.get('decision')
-                    suggestion['assigned_speaker'] = decision.get('assigned_speaker')
+        # Detect UNKNOWN speaker segments and generate suggestions; the engine keeps
+        # per-video state so later decisions only recompute their neighbourhood
+        engine = create_suggestion_engine(video_path, transcript["sentences"], reviewed, context_window)
+        unknown_speaker_suggestions = engine.all_suggestions()
 
         # Get list of all known speakers for the UI
         known_speakers = list(set(
@@ -533,8 +695,18 @@ def load_video_data():
             if s.get('speaker') and 'UNKNOWN' not in s.get('speaker', '').upper()
         ))
 
-        # Parse speaker names from markdown
-        speaker_names = parse_speaker_names(corrections_md)
+        # Speaker names parsed from markdown
+        speaker_names = cached_corrections["speaker_names"]
+
+        # Lite mode: the client pages through /api/corrections and
+        # /api/speaker-suggestions instead of receiving everything up front
+        if lite:
+            correction_counts = cached_corrections["index"].counts()
+            suggestion_counts = get_suggestion_index(str(video_path), engine).counts()
+            corrections = []
+            unknown_speaker_suggestions = []
+        else:
+            correction_counts = suggestion_counts = None
 
         return jsonify({
             "video_path": str(video_path),
@@ -542,6 +714,8 @@ def load_video_data():
             "transcript": transcript,
             "reviewed": reviewed,
             "unknown_speaker_suggestions": unknown_speaker_suggestions,
+            "correction_counts": correction_counts,
+            "suggestion_counts": suggestion_counts,
             "known_speakers": sorted(known_speakers),
             "speaker_names": speaker_names,
             "corrections_path": str(corrections_path),
@@ -552,6 +726,357 @@ def load_video_data():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/speaker-decision', methods=['POST'])
+@profiled
+def apply_speaker_decision():
+    """Record one UNKNOWN speaker decision and return only the suggestions it changed."""
+    data = request.json or {}
+    video_path = data.get('video_path')
+    sentence_id = data.get('sentence_id')
+
+    if not video_path or sentence_id is None:
+        return jsonify({"error": "Video path and sentence_id required"}), 400
+
+    engine = _suggestion_engines.get(str(Path(video_path)))
+    if not engine:
+        return jsonify({"error": "No suggestion state for this video. Reload it."}), 409
+
+    with engine.lock:
+        changed = engine.apply_decision(
+            sentence_id,
+            data.get('decision'),
+            data.get('assigned_speaker'),
+            data.get('status', 'decided')
+        )
+
+    if changed is None:
+        return jsonify({"error": f"No UNKNOWN segment with sentence_id {sentence_id}"}), 404
+
+    return jsonify({"changed": changed, "timeline_version": engine.timeline.version})
+
+
+@app.route('/api/segment-split', methods=['POST'])
+def apply_segment_split():
+    """Reassign one sentence via a segment split (new_speaker null removes it)."""
+    data = request.json or {}
+    video_path = data.get('video_path')
+    sentence_id = data.get('sentence_id')
+
+    if not video_path or sentence_id is None:
+        return jsonify({"error": "Video path and sentence_id required"}), 400
+
+    engine = _suggestion_engines.get(str(Path(video_path)))
+    if not engine:
+        return jsonify({"error": "No suggestion state for this video. Reload it."}), 409
+
+    with engine.lock:
+        changed = engine.apply_split(sentence_id, data.get('new_speaker'))
+
+    if changed is None:
+        return jsonify({"error": f"No sentence with sentence_id {sentence_id}"}), 404
+
+    return jsonify({"changed": changed, "timeline_version": engine.timeline.version})
+
+
+@app.route('/api/speaker-timeline', methods=['GET'])
+def speaker_timeline():
+    """
+    Run-length-encoded speaker turns for the timeline/minimap.
+
+    Reflects speaker decisions and segment splits applied so far. Supports
+    If-None-Match, so an unchanged timeline costs a 304.
+    """
+    video_path = request.args.get('video')
+
+    if not video_path:
+        return jsonify({"error": "Video path required"}), 400
+
+    video_path = Path(video_path)
+    transcript_path = video_path.parent / "transcription_v7" / f"{video_path.stem}_v7.json"
+    if str(video_path) not in _suggestion_engines and not transcript_path.exists():
+        return jsonify({"error": f"Transcript file not found: {transcript_path}"}), 404
+
+    engine = get_suggestion_engine(video_path)
+    with engine.lock:
+        etag = engine.timeline.etag()
+        if etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers={"ETag": etag})
+        payload = engine.timeline.payload()
+
+    return Response(payload, mimetype='application/json', headers={"ETag": etag})
+
+
+# Id of the most recent progress refresh job, so only one runs at a time
+_progress_refresh_job = [None]
+
+
+@app.route('/api/progress', methods=['GET'])
+def review_progress():
+    """
+    Report pending/accepted/rejected counts per course, folder or video.
+
+    Answers from the rollup index; if it is stale (or refresh=1) a background
+    refresh job is scheduled and its id returned.
+    """
+    level = request.args.get('level', 'course')
+    prefix = request.args.get('path')
+    force_refresh = request.args.get('refresh') == '1'
+
+    if level not in ('course', 'folder', 'video'):
+        return jsonify({"error": f"Unknown level: {level}"}), 400
+
+    refresh_job = job_manager.get(_progress_refresh_job[0]) if _progress_refresh_job[0] else None
+    refresh_running = refresh_job is not None and refresh_job.status in ('queued', 'running')
+    if (force_refresh or progress_rollup.is_stale()) and not refresh_running:
+        refresh_job = job_manager.submit('progress_refresh', {"path": BASE_DIR})
+        _progress_refresh_job[0] = refresh_job.id
+
+    summary = progress_rollup.summary(level, prefix)
+    summary["refresh_job"] = refresh_job.to_dict() if refresh_job else None
+    return jsonify(summary)
+
+
+def get_suggestion_engine(video_path):
+    """Get the suggestion state for a video, building it from disk if it was not loaded yet."""
+    engine = _suggestion_engines.get(str(video_path))
+    if engine:
+        return engine
+
+    video_path = Path(video_path)
+    transcript_path = video_path.parent / "transcription_v7" / f"{video_path.stem}_v7.json"
+    reviewed_path = video_path.parent / "selected_ai_edits" / f"{video_path.stem}_reviewed.json"
+
+    reviewed = None
+    if reviewed_path.exists():
+        with open(reviewed_path, 'r', encoding='utf-8') as f:
+            reviewed = json.load(f)
+
+    return create_suggestion_engine(video_path, list(iter_sentences(transcript_path)), reviewed)
+
+
+# Suggestion indexes keyed by video path, as (engine, engine.version, ItemIndex)
+_suggestion_indexes = {}
+
+
+def get_suggestion_index(cache_key, engine):
+    """Time-ordered index over an engine's suggestions, rebuilt only after suggestions change."""
+    cached = _suggestion_indexes.get(cache_key)
+    if cached and cached[0] is engine and cached[1] == engine.version:
+        return cached[2]
+
+    index = ItemIndex(engine.all_suggestions(), "start", "sentence_id")
+    _suggestion_indexes[cache_key] = (engine, engine.version, index)
+    return index
+
+
+def _parse_list_arg(name):
+    value = request.args.get(name)
+    return set(v for v in value.split(',') if v) if value else None
+
+
+def _time_range_predicate(item, time_key, start, end):
+    """Exact range check; the index already bounds the walk, this drops items without a time."""
+    t = item.get(time_key)
+    if start is not None and (t is None or t < start):
+        return False
+    if end is not None and (t is None or t > end):
+        return False
+    return True
+
+
+def _resolve_review_index(kind):
+    """
+    Get the ItemIndex for the video named in the request.
+
+    Returns:
+        Tuple of (index, None) or (None, error response)
+    """
+    video_path = request.args.get('video')
+    if not video_path:
+        return None, (jsonify({"error": "Video path required"}), 400)
+
+    video_path = Path(video_path)
+    transcript_path = video_path.parent / "transcription_v7" / f"{video_path.stem}_v7.json"
+    if not transcript_path.exists():
+        return None, (jsonify({"error": f"Transcript file not found: {transcript_path}"}), 404)
+
+    if kind == 'corrections':
+        corrections_path = find_corrections_path(video_path.parent, video_path.stem)
+        if not corrections_path.exists():
+            return None, (jsonify({"error": f"Corrections file not found: {corrections_path}"}), 404)
+        return get_cached_corrections(corrections_path, transcript_path)["index"], None
+
+    engine = get_suggestion_engine(video_path)
+    with engine.lock:
+        return get_suggestion_index(str(video_path), engine), None
+
+
+def _page_response(index, predicate, statuses, start=None, end=None):
+    limit = min(max(request.args.get('limit', type=int, default=50), 1), 500)
+    try:
+        items, next_cursor = index.query(predicate, request.args.get('cursor'), limit, statuses, start, end)
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    return jsonify({
+        "items": items,
+        "next_cursor": next_cursor,
+        "counts": index.counts()
+    })
+
+
+def _next_response(index, time_key):
+    status = request.args.get('status', 'pending')
+    after = request.args.get('after', type=float, default=-1.0)
+    before = request.args.get('direction') == 'prev'
+
+    item = index.next_with_status(status, after, before)
+    return jsonify({"item": item, "time": item.get(time_key) if item else None})
+
+
+@app.route('/api/corrections', methods=['GET'])
+@profiled
+def query_corrections():
+    """
+    Page through a video's corrections in time order.
+
+    Filters: status, type (correction_type), speaker (comma-separated lists),
+    start/end (seconds). Pass next_cursor back as cursor for the next page.
+    """
+    index, error = _resolve_review_index('corrections')
+    if error:
+        return error
+
+    statuses = _parse_list_arg('status')
+    types = _parse_list_arg('type')
+    speakers = _parse_list_arg('speaker')
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+
+    def predicate(corr):
+        if types and corr.get('correction_type') not in types:
+            return False
+        if speakers and corr.get('speaker') not in speakers:
+            return False
+        return _time_range_predicate(corr, 'timestamp', start, end)
+
+    return _page_response(index, predicate, statuses, start, end)
+
+
+@app.route('/api/corrections/next', methods=['GET'])
+def next_correction():
+    """Nearest correction with a status (default pending) after ?after=t, or before it with direction=prev."""
+    index, error = _resolve_review_index('corrections')
+    if error:
+        return error
+    return _next_response(index, 'timestamp')
+
+
+@app.route('/api/speaker-suggestions', methods=['GET'])
+@profiled
+def query_speaker_suggestions():
+    """
+    Page through a video's UNKNOWN speaker suggestions in time order.
+
+    Filters: status, type (suggestion_type), speaker (matches neighbouring or
+    top candidate speaker), min_confidence/max_confidence, start/end (seconds).
+    """
+    index, error = _resolve_review_index('suggestions')
+    if error:
+        return error
+
+    statuses = _parse_list_arg('status')
+    types = _parse_list_arg('type')
+    speakers = _parse_list_arg('speaker')
+    min_confidence = request.args.get('min_confidence', type=float)
+    max_confidence = request.args.get('max_confidence', type=float)
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+
+    def predicate(suggestion):
+        if types and suggestion.get('suggestion_type') not in types:
+            return False
+        if min_confidence is not None and suggestion.get('confidence', 0) < min_confidence:
+            return False
+        if max_confidence is not None and suggestion.get('confidence', 0) > max_confidence:
+            return False
+        if speakers:
+            candidates = suggestion.get('candidate_speakers') or []
+            related = {
+                suggestion.get('prev_speaker'),
+                suggestion.get('next_speaker'),
+                suggestion.get('assigned_speaker'),
+                candidates[0]['speaker'] if candidates else None
+            }
+            if not speakers & related:
+                return False
+        return _time_range_predicate(suggestion, 'start', start, end)
+
+    return _page_response(index, predicate, statuses, start, end)
+
+
+@app.route('/api/speaker-suggestions/next', methods=['GET'])
+def next_speaker_suggestion():
+    """Nearest suggestion with a status (default pending) after ?after=t, or before it with direction=prev."""
+    index, error = _resolve_review_index('suggestions')
+    if error:
+        return error
+    return _next_response(index, 'start')
+
+
+@app.route('/api/corrections/instances', methods=['POST'])
+def preview_all_instances():
+    """Preview every transcript occurrence of "(all instances)" corrections."""
+    data = request.json or {}
+    video_path = data.get('video_path')
+    ids = data.get('ids')
+
+    if not video_path:
+        return jsonify({"error": "Video path required"}), 400
+
+    video_path = Path(video_path)
+    video_name = video_path.stem
+    video_dir = video_path.parent
+
+    corrections_path = find_corrections_path(video_dir, video_name)
+    transcript_path = video_dir / "transcription_v7" / f"{video_name}_v7.json"
+
+    if not corrections_path.exists():
+        return jsonify({"error": f"Corrections file not found: {corrections_path}"}), 404
+
+    if not transcript_path.exists():
+        return jsonify({"error": f"Transcript file not found: {transcript_path}"}), 404
+
+    try:
+        with open(corrections_path, 'r', encoding='utf-8') as f:
+            corrections = parse_corrections_markdown(f.read())
+
+        batch = [
+            c for c in corrections
+            if c.get('scope') == 'all_instances' and (ids is None or c.get('id') in ids)
+        ]
+
+        sentences = iter_sentences(transcript_path, ('id', 'text', 'start'), words=True)
+        instances = find_all_instances(sentences, batch)
+
+        return jsonify({
+            "video_path": str(video_path),
+            "instances": [
+                {
+                    "id": c.get('id'),
+                    "original": c.get('original'),
+                    "suggested": c.get('suggested'),
+                    "hit_count": instances[c.get('id')]["hit_count"],
+                    "locations": instances[c.get('id')]["instances"]
+                }
+                for c in batch
+            ],
+            "total_hits": sum(entry["hit_count"] for entry in instances.values())
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 def update_markdown_with_decisions(md_path, corrections, output_dir, speaker_names=None):
     """Create a reviewed markdown file with decisions (does not modify original)."""
     with open(md_path, 'r', encoding='utf-8') as f:
@@ -624,7 +1149,7 @@ def build_corrected_transcript(transcript, speaker_names, speaker_decisions, seg
     Build a complete corrected transcript with speaker assignments applied.
 
     Args:
-        transcript: Original transcript data from _v7.json
+        transcript: Original transcript data from _v7.json (parsed dict or CompactTranscript)
         speaker_names: Dict mapping speaker IDs to names (e.g., {"SPEAKER_00": "Tommy"})
         speaker_decisions: List of UNKNOWN speaker decisions with assigned_speaker
         segment_splits: List of segment split markers (optional)
@@ -696,7 +1221,19 @@ def build_corrected_transcript(transcript, speaker_names, speaker_decisions, seg
     return corrected_sentences
 
 
+def correction_statistics(corrections):
+    """Count corrections by review status."""
+    return {
+        "total": len(corrections),
+        "accepted": sum(1 for c in corrections if c.get("status") == "accepted"),
+        "rejected": sum(1 for c in corrections if c.get("status") == "rejected"),
+        "ignored": sum(1 for c in corrections if c.get("status") == "ignored"),
+        "pending": sum(1 for c in corrections if c.get("status") == "pending")
+    }
+
+
 @app.route('/api/save', methods=['POST'])
+@profiled
 def save_reviewed():
     """Save reviewed corrections to markdown and speaker decisions to JSON."""
     data = request.json
@@ -705,7 +1242,6 @@ def save_reviewed():
     corrections = data.get('corrections', [])
     speaker_decisions = data.get('speaker_decisions', [])
     speaker_names = data.get('speaker_names', {})
-    segment_splits = data.get('segment_splits', [])
 
     if not video_path:
         return jsonify({"error": "Missing video path"}), 400
@@ -713,6 +1249,27 @@ def save_reviewed():
     video_path = Path(video_path)
     video_name = video_path.stem
     video_dir = video_path.parent
+    json_path = video_dir / "selected_ai_edits" / f"{video_name}_reviewed.json"
+
+    # Segment splits are only replaced when the request sends them; otherwise
+    # keep the ones recorded through /api/segment-split (or the last save)
+    engine = _suggestion_engines.get(str(video_path))
+    if 'segment_splits' in data:
+        segment_splits = data.get('segment_splits') or []
+        if engine:
+            with engine.lock:
+                engine.set_splits(segment_splits)
+    elif engine:
+        with engine.lock:
+            segment_splits = engine.split_markers()
+    else:
+        segment_splits = []
+        if json_path.exists():
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    segment_splits = json.load(f).get('segment_splits', [])
+            except (OSError, ValueError):
+                pass
 
     # Find the corrections markdown file
     corrections_dir = video_dir / "online_ai_suggested_edits"
@@ -730,13 +1287,7 @@ def save_reviewed():
             original_transcript = json.load(f)
 
     # Calculate correction statistics
-    correction_stats = {
-        "total": len(corrections),
-        "accepted": sum(1 for c in corrections if c.get("status") == "accepted"),
-        "rejected": sum(1 for c in corrections if c.get("status") == "rejected"),
-        "ignored": sum(1 for c in corrections if c.get("status") == "ignored"),
-        "pending": sum(1 for c in corrections if c.get("status") == "pending")
-    }
+    correction_stats = correction_statistics(corrections)
 
     # Calculate speaker decision statistics
     speaker_stats = {
@@ -758,8 +1309,6 @@ def save_reviewed():
             reviewed_md_path = update_markdown_with_decisions(md_path, corrections, output_dir, speaker_names)
 
         # Create JSON file with speaker names and text changes (legacy format)
-        json_path = output_dir / f"{video_name}_reviewed.json"
-
         # Extract only the corrections that have changes (accepted or rejected)
         text_changes = []
         for c in corrections:
@@ -769,15 +1318,28 @@ def save_reviewed():
                     "sentence_id": c.get("sentence_id"),
                     "original": c.get("original"),
                     "corrected": c.get("final"),
-                    "status": c.get("status")
+                    "status": c.get("status"),
+                    "scope": c.get("scope", "single")
                 })
 
+        # Expand "(all instances)" changes to every occurrence in one transcript pass
+        batch_changes = [
+            change for change in text_changes
+            if change["scope"] == "all_instances" and change["original"] != change["corrected"]
+        ]
+        if batch_changes and original_transcript:
+            instances = find_all_instances(original_transcript.get('sentences', []), batch_changes)
+            for change in batch_changes:
+                change["instance_count"] = instances[change["id"]]["hit_count"]
+                change["instances"] = instances[change["id"]]["instances"]
+
         json_data = {
             "source_video": str(video_path),
             "reviewed_at": datetime.now().isoformat(),
             "speaker_names": speaker_names,
             "text_changes": text_changes,
             "speaker_decisions": speaker_decisions,
+            "segment_splits": segment_splits,
             "correction_statistics": correction_stats,
             "speaker_statistics": speaker_stats
         }
@@ -785,6 +1347,10 @@ def save_reviewed():
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(json_data, f, indent=2, ensure_ascii=False)
 
+        # Keep the library progress rollup current without a rescan (the index
+        # file itself is written in the background)
+        progress_rollup.update_video(video_path, correction_stats, speaker_stats, json_path)
+
         # Create complete corrected transcript with speaker assignments (_speakers.json)
         speakers_json_path = output_dir / f"{video_name}_speakers.json"
 
@@ -824,15 +1390,20 @@ def save_reviewed():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/api/export', methods=['POST'])
-def export_training_data():
-    """Export corrected transcript and training data."""
-    data = request.json
-    video_path = data.get('video_path')
+def export_video_training(video_path, mode='pairs', window=DEFAULT_EXPORT_WINDOW):
+    """
+    Write training data for one video from its reviewed text changes.
 
-    if not video_path:
-        return jsonify({"error": "Video path required"}), 400
+    The "pairs" mode writes bare {"original", "corrected"} pairs. The
+    "context" mode joins each change with its sentence, a window of
+    neighbouring sentences, the speaker name and the aligned word timings.
+
+    Returns:
+        Dict with training_file and pair_count
 
+    Raises:
+        FileNotFoundError if the reviewed data or transcript is missing
+    """
     video_path = Path(video_path)
     video_name = video_path.stem
     video_dir = video_path.parent
@@ -841,48 +1412,289 @@ def export_training_data():
     transcript_path = video_dir / "transcription_v7" / f"{video_name}_v7.json"
 
     if not reviewed_path.exists():
-        return jsonify({"error": "No reviewed data found. Save first."}), 404
+        raise FileNotFoundError("No reviewed data found. Save first.")
 
-    try:
-        # Load reviewed corrections
-        with open(reviewed_path, 'r', encoding='utf-8') as f:
-            reviewed = json.load(f)
+    # Load reviewed corrections
+    with open(reviewed_path, 'r', encoding='utf-8') as f:
+        reviewed = json.load(f)
 
-        # Load original transcript
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript = json.load(f)
-
-        # Generate training pairs (only accepted and rejected with custom text)
-        training_pairs = []
-        for corr in reviewed['corrections']:
-            if corr['status'] in ['accepted', 'rejected'] and corr.get('final'):
-                if corr['original'] != corr['final']:  # Only if there's an actual change
-                    training_pairs.append({
-                        "original": corr['original'],
-                        "corrected": corr['final']
-                    })
+    # Only changes where the final text differs from the original
+    changes = reviewed_text_changes(reviewed)
 
-        # Save training data
-        output_dir = video_dir / "selected_ai_edits"
-        training_path = output_dir / f"{video_name}_training.jsonl"
+    output_dir = video_dir / "selected_ai_edits"
+
+    if mode == 'context':
+        if not transcript_path.exists():
+            raise FileNotFoundError(f"Transcript file not found: {transcript_path}")
+
+        # One streaming pass; word arrays are only parsed for changed sentences, and
+        # nothing is added to the word cache, so library-wide export jobs stay small
+        changed_ids = set(change.get('sentence_id') for change in changes)
+        sentences = iter_sentences(transcript_path, words=changed_ids)
+        training_path = output_dir / f"{video_name}_training_context.jsonl"
+        record_count = 0
 
         with open(training_path, 'w', encoding='utf-8') as f:
-            for pair in training_pairs:
-                f.write(json.dumps(pair, ensure_ascii=False) + '\n')
+            for record in iter_context_records(
+                sentences,
+                changes,
+                reviewed.get('speaker_names', {}),
+                reviewed.get('speaker_decisions', []),
+                window
+            ):
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                record_count += 1
 
-        return jsonify({
-            "success": True,
-            "training_file": str(training_path),
-            "pair_count": len(training_pairs)
-        })
+        return {"training_file": str(training_path), "pair_count": record_count}
+
+    # Generate training pairs
+    training_pairs = [
+        {"original": change['original'], "corrected": change['corrected']}
+        for change in changes
+    ]
+
+    # Save training data
+    training_path = output_dir / f"{video_name}_training.jsonl"
+
+    with open(training_path, 'w', encoding='utf-8') as f:
+        for pair in training_pairs:
+            f.write(json.dumps(pair, ensure_ascii=False) + '\n')
+
+    return {"training_file": str(training_path), "pair_count": len(training_pairs)}
+
+
+@app.route('/api/export', methods=['POST'])
+@profiled
+def export_training_data():
+    """Export training data (see export_video_training for the modes)."""
+    data = request.json
+    video_path = data.get('video_path')
+    mode = data.get('mode', 'pairs')
+    window = data.get('window', DEFAULT_EXPORT_WINDOW)
+
+    if not video_path:
+        return jsonify({"error": "Video path required"}), 400
+
+    if mode not in ('pairs', 'context'):
+        return jsonify({"error": f"Unknown export mode: {mode}"}), 400
+
+    if not valid_window(window):
+        return jsonify({"error": "window must be a non-negative integer"}), 400
+
+    try:
+        result = export_video_training(video_path, mode, window)
+        return jsonify({"success": True, **result})
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-# Cache for transcript word data to avoid re-reading files
+# ----- Background jobs -----
+
+@job_manager.register('scan')
+def scan_job(job, params):
+    """Library scan (find_video_folders) as a background job."""
+    def report(scanned, found, directory):
+        job.update(done=scanned, message=f"{found} videos found, scanning {directory}")
+
+    return {"files": find_video_folders(params.get('path', BASE_DIR), params.get('max_depth', 3), report)}
+
+
+def _job_video_paths(job, params):
+    """Video paths for a batch job: explicit "video_paths", or every reviewable video under "path"."""
+    if params.get('video_paths'):
+        return list(params['video_paths'])
+
+    job.update(message="Scanning library")
+    return [f["video_path"] for f in find_video_folders(params.get('path', BASE_DIR), params.get('max_depth', 3))]
+
+
+@job_manager.register('export')
+def bulk_export_job(job, params):
+    """Export training data for many videos."""
+    mode = params.get('mode', 'pairs')
+    if mode not in ('pairs', 'context'):
+        raise ValueError(f"Unknown export mode: {mode}")
+    window = params.get('window', DEFAULT_EXPORT_WINDOW)
+    if not valid_window(window):
+        raise ValueError("window must be a non-negative integer")
+
+    video_paths = _job_video_paths(job, params)
+    exported = []
+    skipped = []
+
+    for i, video_path in enumerate(video_paths):
+        job.update(done=i, total=len(video_paths), message=f"Exporting {Path(video_path).name}")
+        try:
+            exported.append({"video_path": video_path,
+                             **export_video_training(video_path, mode, window)})
+        except FileNotFoundError as e:
+            skipped.append({"video_path": video_path, "reason": str(e)})
+
+    job.update(done=len(video_paths), total=len(video_paths), message="Done")
+    return {
+        "exported": exported,
+        "skipped": skipped,
+        "pair_count": sum(e["pair_count"] for e in exported)
+    }
+
+
+@job_manager.register('speaker_suggestions')
+def speaker_suggestions_job(job, params):
+    """Batch UNKNOWN speaker analysis: suggestion counts and top candidates per video."""
+    context_window = params.get('context_window', DEFAULT_CONTEXT_WINDOW)
+    if not valid_window(context_window):
+        raise ValueError("context_window must be a non-negative integer")
+
+    video_paths = _job_video_paths(job, params)
+    videos = []
+
+    for i, video_path in enumerate(video_paths):
+        job.update(done=i, total=len(video_paths), message=f"Analyzing {Path(video_path).name}")
+        video_path = Path(video_path)
+        transcript_path = video_path.parent / "transcription_v7" / f"{video_path.stem}_v7.json"
+        if not transcript_path.exists():
+            continue
+
+        # Headers only, so a batch over the library does not fill the word cache
+        suggestions = detect_unknown_speakers({"sentences": list(iter_sentences(transcript_path))}, context_window)
+        by_type = {}
+        for suggestion in suggestions:
+            by_type[suggestion["suggestion_type"]] = by_type.get(suggestion["suggestion_type"], 0) + 1
+
+        videos.append({
+            "video_path": str(video_path),
+            "unknown_segments": len(suggestions),
+            "suggestion_types": by_type,
+            "suggestions": [
+                {
+                    "sentence_id": s["sentence_id"],
+                    "suggestion_type": s["suggestion_type"],
+                    "confidence": s["confidence"],
+                    "top_candidate": s["candidate_speakers"][0] if s["candidate_speakers"] else None
+                }
+                for s in suggestions
+            ]
+        })
+
+    job.update(done=len(video_paths), total=len(video_paths), message="Done")
+    return {"videos": videos}
+
+
+@job_manager.register('progress_refresh')
+def progress_refresh_job(job, params):
+    """Reconcile the progress rollup with _reviewed.json files on disk."""
+    root = params.get('path', BASE_DIR)
+    if not Path(root).exists():
+        # Don't drop every entry just because the share is unreachable
+        raise FileNotFoundError(f"Library path not found: {root}")
+
+    job.update(message="Scanning library")
+    files = find_video_folders(root, params.get('max_depth', 3))
+
+    def count_pending(corrections_path):
+        with open(corrections_path, 'r', encoding='utf-8') as f:
+            return correction_statistics(parse_corrections_markdown(f.read()))
+
+    def report(done, total):
+        job.update(done=done, total=total, message="Reading review files")
+
+    reread = progress_rollup.refresh(root, files, count_pending, report)
+    job.update(done=len(files), total=len(files), message="Done")
+    return {"videos": len(files), "reread": reread}
+
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """List background jobs, newest first."""
+    return jsonify({
+        "jobs": [job.to_dict() for job in job_manager.list()],
+        "kinds": job_manager.kinds,
+        "max_workers": job_manager.max_workers
+    })
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Submit a background job: {"kind": ..., "params": {...}}."""
+    data = request.json or {}
+    kind = data.get('kind')
+
+    if not kind:
+        return jsonify({"error": "Job kind required"}), 400
+
+    try:
+        job = job_manager.submit(kind, data.get('params', {}))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(job.to_dict()), 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Poll a job's status, progress and (once finished) result."""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict(include_result=True))
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Request cancellation of a queued or running job."""
+    job = job_manager.cancel(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/debug/profiles', methods=['GET'])
+def debug_profiles():
+    """List captured request profiles, newest first (see request_profiling)."""
+    return jsonify({"profiles": list_profiles()})
+
+
+@app.route('/api/debug/profiles/<profile_id>', methods=['GET'])
+def debug_profile_summary(profile_id):
+    """Top functions by cumulative time for one captured profile, as plain text."""
+    report = profile_summary(profile_id, limit=request.args.get('limit', type=int, default=40))
+    if report is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return Response(report, mimetype='text/plain')
+
+
+@app.route('/api/debug/profiles/<profile_id>/<kind>', methods=['GET'])
+def debug_profile_download(profile_id, kind):
+    """Download a profile artifact: pstats, collapsed (flamegraph stacks) or json."""
+    path = profile_artifact_path(profile_id, kind)
+    if not path:
+        return jsonify({"error": "Profile not found"}), 404
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+
+
+# Cache of compact transcripts keyed by path, to avoid re-reading files
+# Values are (mtime, CompactTranscript) so edited transcripts are picked up
 _word_cache = {}
 
+
+def get_cached_transcript(transcript_path):
+    """Load a _v7.json transcript into the compact model, reusing the cached copy if unchanged."""
+    cache_key = str(transcript_path)
+    mtime = os.path.getmtime(transcript_path)
+
+    cached = _word_cache.get(cache_key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    transcript = load_compact_transcript(transcript_path)
+    _word_cache[cache_key] = (mtime, transcript)
+    return transcript
+
+
 @app.route('/api/words-chunk', methods=['GET'])
+@profiled
 def get_words_chunk():
     """Get word timing data for a time range (5 minute chunks)."""
     video_path = request.args.get('video')
@@ -897,21 +1709,15 @@ def get_words_chunk():
     video_dir = video_path.parent
     transcript_path = video_dir / "transcription_v7" / f"{video_name}_v7.json"
 
-    cache_key = str(transcript_path)
-
     # Load and cache transcript data
-    if cache_key not in _word_cache:
-        if not transcript_path.exists():
-            return jsonify({"sentences": [], "chunk_start": start_time, "chunk_end": start_time + chunk_duration})
+    if not transcript_path.exists():
+        return jsonify({"sentences": [], "chunk_start": start_time, "chunk_end": start_time + chunk_duration})
 
-        try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            _word_cache[cache_key] = data.get("sentences", [])
-        except Exception:
-            return jsonify({"sentences": [], "chunk_start": start_time, "chunk_end": start_time + chunk_duration})
+    try:
+        sentences = get_cached_transcript(transcript_path).sentences
+    except Exception:
+        return jsonify({"sentences": [], "chunk_start": start_time, "chunk_end": start_time + chunk_duration})
 
-    sentences = _word_cache[cache_key]
     end_time = start_time + chunk_duration
 
     # Get sentences and words within the time range
@@ -925,17 +1731,8 @@ def get_words_chunk():
 
         # Include sentence if it overlaps with the time range
         if s_end >= start_time and s_start <= end_time:
-            # Extract words from original_sentences
-            words = []
-            orig_sentences = sentence.get("original_sentences", [])
-            if orig_sentences:
-                for orig in orig_sentences:
-                    for w in orig.get("words", []):
-                        words.append({
-                            "word": w.get("word", ""),
-                            "start": w.get("start"),
-                            "end": w.get("end")
-                        })
+            # Extract words from the compact word columns
+            words = sentence.words()
 
             chunk_sentences.append({
                 "id": sentence.get("id"),
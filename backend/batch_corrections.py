@@ -0,0 +1,101 @@
+"""
+Transcript-wide matching for "(all instances)" corrections.
+
+All patterns are compiled into a single alternation so the transcript is
+scanned once no matter how many batch corrections a video has.
+"""
+import re
+
+
+def build_instance_matcher(corrections):
+    """
+    Compile one case-insensitive matcher for a set of corrections.
+
+    Patterns only match on word boundaries, so "AK" will not hit inside
+    "BAKE". Longer patterns are tried first so "Ace-King suited" wins over
+    "Ace-King" when both are present. Each pattern is its own named group,
+    so a match is attributed via match.lastgroup rather than by re-folding
+    the matched text (str.lower() does not always agree with IGNORECASE).
+
+    Returns:
+        Tuple of (compiled regex or None, dict mapping group name -> list of correction ids)
+    """
+    # Patterns equal up to case share a group
+    pattern_ids = {}
+    for corr in corrections:
+        original = (corr.get('original') or '').strip()
+        if original:
+            pattern_ids.setdefault(original.casefold(), (original, []))[1].append(corr.get('id'))
+
+    if not pattern_ids:
+        return None, {}
+
+    alternatives = sorted(pattern_ids.values(), key=lambda item: len(item[0]), reverse=True)
+    group_ids = {f"p{k}": ids for k, (_, ids) in enumerate(alternatives)}
+    matcher = re.compile(
+        r'(?<!\w)(?:' + '|'.join(
+            f"(?P<p{k}>{re.escape(original)})" for k, (original, _) in enumerate(alternatives)
+        ) + r')(?!\w)',
+        re.IGNORECASE
+    )
+    return matcher, group_ids
+
+
+def _word_start_times(sentence):
+    """Flatten word start times from original_sentences, in transcript order."""
+    times = []
+    for orig in sentence.get('original_sentences', []):
+        for w in orig.get('words', []):
+            times.append(w.get('start'))
+    return times
+
+
+def find_all_instances(sentences, corrections):
+    """
+    Find every occurrence of the corrections' original text across a transcript.
+
+    Args:
+        sentences: Transcript sentences (full _v7.json sentences give word-level timestamps)
+        corrections: Corrections to match; each needs "id" and "original"
+
+    Returns:
+        Dict mapping correction id -> {"hit_count", "instances"} where each instance
+        has sentence_id, char offset, matched text and timestamp
+    """
+    matcher, group_ids = build_instance_matcher(corrections)
+    results = {
+        corr.get('id'): {"hit_count": 0, "instances": []}
+        for corr in corrections
+    }
+    if matcher is None:
+        return results
+
+    for i, sentence in enumerate(sentences):
+        text = sentence.get('text', '')
+        if not text:
+            continue
+
+        word_times = None
+        for match in matcher.finditer(text):
+            if word_times is None:
+                word_times = _word_start_times(sentence)
+
+            # Use the word timing when the transcript text and word list line up
+            word_index = len(text[:match.start()].split())
+            timestamp = sentence.get('start')
+            if word_index < len(word_times) and word_times[word_index] is not None:
+                timestamp = word_times[word_index]
+
+            instance = {
+                "sentence_id": sentence.get('id', i),
+                "offset": match.start(),
+                "matched": match.group(0),
+                "timestamp": timestamp
+            }
+            for corr_id in group_ids[match.lastgroup]:
+                entry = results[corr_id]
+                entry["hit_count"] += 1
+                entry["instances"].append(instance)
+
+    return results
+
@@ -0,0 +1,106 @@
+"""
+Memory benchmark: parsed _v7.json dicts vs the compact transcript model.
+
+Generates a synthetic transcript with realistic speech density, measures
+the memory held by each representation with tracemalloc, and reports the
+cost per hour of transcript.
+
+Usage:
+    python benchmark_memory.py [--hours 2] [--transcript path/to/video_v7.json]
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from app import build_corrected_transcript, detect_unknown_speakers
+from transcript_model import CompactTranscript
+
+WORDS_PER_MINUTE = 160
+SPEAKERS = ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02", "UNKNOWN"]
+VOCAB = [
+    "ace", "king", "queen", "jack", "ten", "check", "raise", "fold", "call",
+    "the", "pot", "river", "turn", "flop", "button", "blind", "so", "here",
+    "we", "have", "a", "bet", "range", "value", "bluff", "stack", "sizing",
+]
+
+
+def generate_v7(hours, seed=0):
+    """Build a synthetic _v7.json document covering the given number of hours."""
+    rng = random.Random(seed)
+    sentences = []
+    t = 0.0
+    word_gap = 60.0 / WORDS_PER_MINUTE
+    total_seconds = hours * 3600
+
+    while t < total_seconds:
+        words = []
+        wt = t
+        for _ in range(rng.randint(6, 24)):
+            word = rng.choice(VOCAB)
+            if rng.random() < 0.1:
+                word += ","
+            words.append({"word": " " + word, "start": round(wt, 3), "end": round(wt + word_gap * 0.8, 3)})
+            wt += word_gap
+        speaker = rng.choices(SPEAKERS, [6, 3, 1, 1])[0]
+        sentences.append({
+            "id": len(sentences),
+            "text": "".join(w["word"] for w in words).strip(),
+            "start": round(t, 3),
+            "end": round(wt, 3),
+            "speaker": speaker,
+            "was_unknown": speaker == "UNKNOWN",
+            "original_sentences": [{"text": "", "words": words}]
+        })
+        t = wt + rng.uniform(0.1, 1.5)
+
+    return {"sentences": sentences}
+
+
+def measure(build):
+    """Return (result, bytes retained) for a zero-argument builder."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--hours', type=float, default=2.0, help="Synthetic transcript length")
+    parser.add_argument('--transcript', help="Measure a real _v7.json instead of synthetic data")
+    args = parser.parse_args()
+
+    if args.transcript:
+        with open(args.transcript, 'r', encoding='utf-8') as f:
+            raw = f.read()
+    else:
+        raw = json.dumps(generate_v7(args.hours))
+
+    parsed, dict_bytes = measure(lambda: json.loads(raw))
+    compact, compact_bytes = measure(lambda: CompactTranscript.from_v7(json.loads(raw)))
+
+    sentences = parsed.get("sentences", [])
+    word_count = len(compact.word_text)
+    hours = (sentences[-1].get("end") or 0) / 3600 if sentences else 0
+
+    # Sanity check: the adapters produce the same results on both models
+    assert detect_unknown_speakers(parsed) == detect_unknown_speakers(compact)
+    assert build_corrected_transcript(parsed, {}, []) == build_corrected_transcript(compact, {}, [])
+
+    print(f"Sentences:        {len(sentences):,}")
+    print(f"Words:            {word_count:,}")
+    print(f"Transcript hours: {hours:.2f}")
+    print(f"Dict model:       {dict_bytes / 1e6:8.1f} MB  ({dict_bytes / max(word_count, 1):6.0f} B/word)")
+    print(f"Compact model:    {compact_bytes / 1e6:8.1f} MB  ({compact_bytes / max(word_count, 1):6.0f} B/word)")
+    if hours > 0:
+        print(f"Per hour:         {dict_bytes / hours / 1e6:8.1f} MB -> {compact_bytes / hours / 1e6:.1f} MB")
+    print(f"Reduction:        {dict_bytes / max(compact_bytes, 1):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Speed benchmark: json.load vs the streaming reader for sentence headers.
+
+Writes a synthetic transcript (or uses a real one), then times reading
+every sentence's header fields both ways and reports the peak memory each
+needs while doing it.
+
+Usage:
+    python benchmark_stream.py [--hours 10] [--indent 2] [--transcript path/to/video_v7.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_memory import generate_v7
+from transcript_stream import HEADER_FIELDS, iter_sentences
+
+
+def headers_json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [{k: s[k] for k in HEADER_FIELDS if k in s} for s in data.get('sentences', [])]
+
+
+def headers_stream(path):
+    return list(iter_sentences(path))
+
+
+def count_json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in json.load(f).get('sentences', []))
+
+
+def count_stream(path):
+    return sum(1 for _ in iter_sentences(path))
+
+
+def best_time(fn, path, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(path)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(fn, path):
+    tracemalloc.start()
+    fn(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--hours', type=float, default=10.0, help="Synthetic transcript length")
+    parser.add_argument('--indent', type=int, default=None, help="Pretty-print the synthetic file")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing runs per reader (best is kept)")
+    parser.add_argument('--transcript', help="Read a real _v7.json instead of synthetic data")
+    args = parser.parse_args()
+
+    path = args.transcript
+    if not path:
+        fd, path = tempfile.mkstemp(suffix='_v7.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(generate_v7(args.hours), f, indent=args.indent)
+
+    try:
+        # Sanity check: both readers see the same headers
+        assert headers_stream(path) == headers_json_load(path)
+
+        load_time = best_time(headers_json_load, path, args.repeat)
+        stream_time = best_time(headers_stream, path, args.repeat)
+        load_peak = peak_memory(count_json_load, path)
+        stream_peak = peak_memory(count_stream, path)
+
+        print(f"File size:        {os.path.getsize(path) / 1e6:8.1f} MB")
+        print(f"json.load:        {load_time:8.3f} s   peak {load_peak / 1e6:8.1f} MB")
+        print(f"Streaming reader: {stream_time:8.3f} s   peak {stream_peak / 1e6:8.1f} MB (iterating)")
+        print(f"Speedup:          {load_time / max(stream_time, 1e-9):.1f}x")
+    finally:
+        if not args.transcript:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
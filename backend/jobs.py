@@ -0,0 +1,153 @@
+"""
+Background job executor for long-running library operations.
+
+Jobs run on a bounded thread pool so heavy work (library scans, bulk
+exports, batch speaker analysis) never holds a request thread. Each job
+keeps a record with progress, result and error that the /api/jobs
+endpoints expose for polling. Cancellation is cooperative: job functions
+call job.update() regularly, which raises JobCancelled once a cancel has
+been requested.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of jobs running at once; further jobs wait in the queue
+JOB_MAX_WORKERS = int(os.environ.get('JOB_MAX_WORKERS', 2))
+
+# Number of finished jobs kept for polling before the oldest are dropped
+JOB_HISTORY_LIMIT = 100
+
+FINISHED_STATES = ('completed', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when its cancellation was requested."""
+
+
+class Job:
+    """State of one submitted job."""
+
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.progress = {"done": 0, "total": None, "message": ""}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.future = None
+
+    def update(self, done=None, total=None, message=None):
+        """Report progress; raises JobCancelled if the job should stop."""
+        if done is not None:
+            self.progress["done"] = done
+        if total is not None:
+            self.progress["total"] = total
+        if message is not None:
+            self.progress["message"] = message
+        if self.cancel_requested:
+            raise JobCancelled()
+
+    def to_dict(self, include_result=False):
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """Registry of job kinds plus the bounded pool that runs them."""
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._handlers = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def register(self, kind):
+        """Decorator registering fn(job, params) -> result as the handler for a job kind."""
+        def decorator(fn):
+            self._handlers[kind] = fn
+            return fn
+        return decorator
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def submit(self, kind, params=None):
+        """Queue a job; raises ValueError for unknown kinds."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = Job(kind, params or {})
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.cancel_requested:
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = self._handlers[job.kind](job, job.params)
+            job.status = 'completed'
+        except JobCancelled:
+            job.status = 'cancelled'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the history limit. Caller holds the lock."""
+        finished = [j for j in self._jobs.values() if j.status in FINISHED_STATES]
+        excess = len(finished) - JOB_HISTORY_LIMIT
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.finished_at)[:excess]:
+                del self._jobs[job.id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id):
+        """Request cancellation; queued jobs are cancelled immediately. Returns the job or None."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in FINISHED_STATES:
+            job.cancel_requested = True
+            if job.future and job.future.cancel():
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+        return job
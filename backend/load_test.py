@@ -0,0 +1,339 @@
+"""
+End-to-end load generator simulating concurrent reviewers.
+
+Builds a synthetic course tree, starts a local instance of app.py (or
+targets one given with --url) and runs N reviewer sessions in parallel.
+Each session browses the library, loads a video, then plays it back with
+range requests and seeks, fetches word chunks as playback crosses chunk
+boundaries, and saves in bursts. Reports p50/p95/p99 latency, throughput
+and error rate per endpoint.
+
+Usage:
+    python load_test.py --reviewers 20 --duration 60
+    python load_test.py --url http://localhost:5000 --tree W:\\test_courses
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from benchmark_memory import generate_v7
+
+# Playback model for the synthetic videos
+VIDEO_DURATION_SECONDS = 3600
+RANGE_REQUEST_BYTES = 1024 * 1024
+WORDS_CHUNK_SECONDS = 300
+
+
+def build_course_tree(root, courses, videos_per_course, video_mb, hours):
+    """Create a synthetic course library; returns the list of video paths."""
+    video_paths = []
+    transcript = generate_v7(hours)
+    transcript_json = json.dumps(transcript)
+
+    changelog = ["# Changelog", ""]
+    line = 1
+    for s in transcript["sentences"][::15]:
+        changelog.append(f"## Sentence {s['id']} ({s['speaker']}) [{s['start']}s - {s['end']}s]")
+        first = s["text"].split()[0]
+        changelog.append(f'Line {line}: "{first}" → "{first.capitalize()}" ✓/✗')
+        changelog.append("")
+        line += 1
+    changelog_md = "\n".join(changelog)
+
+    video_bytes = os.urandom(1024 * 1024) * video_mb
+
+    for c in range(courses):
+        for v in range(videos_per_course):
+            video_dir = os.path.join(root, f"Course{c:02d}", f"Module{v:02d}")
+            os.makedirs(os.path.join(video_dir, "transcription_v7"), exist_ok=True)
+            os.makedirs(os.path.join(video_dir, "online_ai_suggested_edits"), exist_ok=True)
+            name = f"video{v:02d}"
+
+            with open(os.path.join(video_dir, f"{name}.mp4"), 'wb') as f:
+                f.write(video_bytes)
+            with open(os.path.join(video_dir, "transcription_v7", f"{name}_v7.json"), 'w', encoding='utf-8') as f:
+                f.write(transcript_json)
+            with open(os.path.join(video_dir, "online_ai_suggested_edits", f"{name}_changelog.md"), 'w', encoding='utf-8') as f:
+                f.write(changelog_md)
+
+            video_paths.append(os.path.join(video_dir, f"{name}.mp4"))
+
+    return video_paths
+
+
+class Stats:
+    """Thread-safe per-endpoint latency and error recorder."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.bytes = {}
+
+    def record(self, endpoint, seconds, ok, nbytes=0):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            self.bytes[endpoint] = self.bytes.get(endpoint, 0) + nbytes
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed):
+        rows = []
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            count = len(values)
+            errors = self.errors.get(endpoint, 0)
+            rows.append({
+                "endpoint": endpoint,
+                "requests": count,
+                "errors": errors,
+                "error_rate": round(errors / count, 4) if count else 0,
+                "throughput_rps": round(count / elapsed, 2) if elapsed else 0,
+                "mb_per_s": round(self.bytes.get(endpoint, 0) / elapsed / 1e6, 2) if elapsed else 0,
+                "p50_ms": round(_percentile(values, 50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 95) * 1000, 1),
+                "p99_ms": round(_percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0
+            })
+        return rows
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+class Reviewer(threading.Thread):
+    """One simulated reviewer session."""
+
+    def __init__(self, index, base_url, tree, video_paths, stats, deadline, args):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.tree = tree
+        self.video_paths = video_paths
+        self.stats = stats
+        self.deadline = deadline
+        self.args = args
+        self.rng = random.Random(index)
+
+    def request(self, endpoint, path, params=None, body=None, headers=None):
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(url, data=data, headers=dict(headers or {}))
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.args.timeout) as response:
+                payload = response.read()
+            self.stats.record(endpoint, time.perf_counter() - started, True, len(payload))
+            return payload
+        except (urllib.error.URLError, OSError):
+            self.stats.record(endpoint, time.perf_counter() - started, False)
+            return None
+
+    def run(self):
+        while time.time() < self.deadline:
+            self.session()
+
+    def session(self):
+        rng = self.rng
+        self.request('/api/browse', '/api/browse', {'path': self.tree})
+
+        video_path = rng.choice(self.video_paths)
+        payload = self.request('/api/load', '/api/load', {'video': video_path})
+        if payload is None:
+            return
+        data = json.loads(payload)
+        corrections = data.get('corrections', [])
+        suggestions = data.get('unknown_speaker_suggestions', [])
+
+        file_size = os.path.getsize(video_path)
+        bytes_per_second = file_size / VIDEO_DURATION_SECONDS
+        position = 0.0
+        chunk = -1
+        actions = 0
+
+        while time.time() < self.deadline and actions < self.args.actions_per_session:
+            actions += 1
+
+            # Seek pattern: mostly sequential playback, sometimes jump to the next item or rewind
+            roll = rng.random()
+            if roll < 0.15:
+                position = rng.uniform(0, VIDEO_DURATION_SECONDS - 1)
+            elif roll < 0.25:
+                position = max(0.0, position - 2)
+            else:
+                position = min(VIDEO_DURATION_SECONDS - 1, position + rng.uniform(1, 10))
+
+            start = int(position * bytes_per_second)
+            end = min(start + RANGE_REQUEST_BYTES, file_size) - 1
+            self.request('/api/video', '/api/video', {'path': video_path},
+                         headers={'Range': f'bytes={start}-{end}'})
+
+            # Word chunk fetch whenever playback crosses a chunk boundary
+            current_chunk = int(position // WORDS_CHUNK_SECONDS)
+            if current_chunk != chunk:
+                chunk = current_chunk
+                self.request('/api/words-chunk', '/api/words-chunk',
+                             {'video': video_path, 'start': chunk * WORDS_CHUNK_SECONDS})
+
+            # Decide on an item, and save in a burst every few decisions
+            if corrections and rng.random() < 0.3:
+                corr = rng.choice(corrections)
+                corr['status'] = rng.choice(['accepted', 'rejected', 'ignored'])
+                corr['final'] = corr.get('suggested') if corr['status'] == 'accepted' else corr.get('original')
+
+            if actions % self.args.save_every == 0:
+                body = {
+                    'video_path': video_path,
+                    'corrections': corrections,
+                    'speaker_decisions': suggestions,
+                    'speaker_names': data.get('speaker_names', {}),
+                    'segment_splits': []
+                }
+                for _ in range(rng.randint(1, 3)):
+                    self.request('/api/save', '/api/save', body=body)
+
+            if self.args.think_time:
+                time.sleep(rng.uniform(0, self.args.think_time))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, state_dir):
+    """
+    Start app.py under the threaded Flask server; returns the process.
+
+    The progress index and profiles go to state_dir so synthetic videos never
+    end up in the real backend/review_progress.json.
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env['PROGRESS_INDEX_PATH'] = os.path.join(state_dir, 'review_progress.json')
+    env['PROFILE_DIR'] = os.path.join(state_dir, 'profiles')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(port), '--with-threads'],
+        cwd=backend_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + '/api/jobs', timeout=1).read()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("Backend did not start")
+
+
+def print_report(rows, elapsed, reviewers):
+    total = sum(r["requests"] for r in rows)
+    errors = sum(r["errors"] for r in rows)
+    print(f"\n{reviewers} reviewers, {elapsed:.1f}s, {total} requests "
+          f"({total / elapsed:.1f} req/s), {errors} errors ({errors / max(total, 1):.2%})\n")
+    header = f"{'endpoint':<18}{'reqs':>7}{'req/s':>8}{'MB/s':>8}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<18}{r['requests']:>7}{r['throughput_rps']:>8}{r['mb_per_s']:>8}"
+              f"{r['error_rate'] * 100:>7.2f}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent reviewers against the backend")
+    parser.add_argument('--reviewers', type=int, default=10, help="Concurrent reviewer sessions")
+    parser.add_argument('--duration', type=float, default=30, help="Test length in seconds")
+    parser.add_argument('--url', help="Target an already running backend instead of starting one")
+    parser.add_argument('--tree', help="Existing course tree to use instead of generating one")
+    parser.add_argument('--courses', type=int, default=3)
+    parser.add_argument('--videos-per-course', type=int, default=4)
+    parser.add_argument('--video-mb', type=int, default=64, help="Size of each synthetic video")
+    parser.add_argument('--transcript-hours', type=float, default=1.0)
+    parser.add_argument('--actions-per-session', type=int, default=200)
+    parser.add_argument('--save-every', type=int, default=25, help="Actions between save bursts")
+    parser.add_argument('--think-time', type=float, default=0.2, help="Max pause between actions (s)")
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--json', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    temp_root = None
+    state_dir = None
+    process = None
+    try:
+        tree = args.tree
+        if tree:
+            video_paths = [
+                os.path.join(dirpath, f)
+                for dirpath, _, files in os.walk(tree)
+                for f in files if f.endswith('.mp4')
+            ]
+        else:
+            temp_root = tempfile.mkdtemp(prefix='review_load_')
+            tree = temp_root
+            print(f"Building synthetic course tree in {tree}")
+            video_paths = build_course_tree(tree, args.courses, args.videos_per_course,
+                                            args.video_mb, args.transcript_hours)
+
+        if not video_paths:
+            raise SystemExit("No videos found")
+
+        url = args.url
+        if not url:
+            state_dir = tempfile.mkdtemp(prefix='review_load_state_')
+            process, url = start_server(_free_port(), state_dir)
+        print(f"Target: {url}, {len(video_paths)} videos")
+
+        stats = Stats()
+        started = time.time()
+        deadline = started + args.duration
+        reviewers = [Reviewer(i, url, tree, video_paths, stats, deadline, args) for i in range(args.reviewers)]
+        for reviewer in reviewers:
+            reviewer.start()
+        for reviewer in reviewers:
+            reviewer.join()
+        elapsed = time.time() - started
+
+        rows = stats.report(elapsed)
+        print_report(rows, elapsed, args.reviewers)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({"reviewers": args.reviewers, "elapsed": elapsed, "endpoints": rows}, f, indent=2)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        if temp_root:
+            shutil.rmtree(temp_root, ignore_errors=True)
+        if state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
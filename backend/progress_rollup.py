@@ -0,0 +1,333 @@
+"""
+Materialized review-progress rollup across the course library.
+
+Keeps per-video correction and speaker counts plus running per-folder and
+per-course totals, so progress can be reported without opening any review
+files. Saves update the rollup directly; a refresh pass picks up
+_reviewed.json files written or changed outside the tool, only re-reading
+files whose mtime or size changed. The index is persisted as JSON so it
+survives restarts; writes after a save are batched in the background so a
+save never waits for the whole index to be dumped.
+"""
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Where the rollup index is stored
+PROGRESS_INDEX_PATH = os.environ.get(
+    'PROGRESS_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'review_progress.json')
+)
+
+# Minimum age (seconds) before /api/progress schedules a background refresh
+PROGRESS_REFRESH_SECONDS = int(os.environ.get('PROGRESS_REFRESH_SECONDS', 300))
+
+# Delay (seconds) before saves are written to the index; saves within it share one write
+PROGRESS_SAVE_DELAY = float(os.environ.get('PROGRESS_SAVE_DELAY', 2))
+
+CORRECTION_COUNTS = ('total', 'accepted', 'rejected', 'ignored', 'pending')
+SPEAKER_COUNTS = ('total', 'pending')
+
+
+def _empty_totals():
+    return {
+        "videos": 0,
+        "reviewed_videos": 0,
+        "corrections": {k: 0 for k in CORRECTION_COUNTS},
+        "speakers": {k: 0 for k in SPEAKER_COUNTS}
+    }
+
+
+def _is_under(path, root):
+    """True if path is root or inside it, comparing whole path components."""
+    path = Path(path)
+    root = Path(root)
+    return path == root or root in path.parents
+
+
+def _apply(totals, entry, sign):
+    totals["videos"] += sign
+    if entry.get("has_reviewed"):
+        totals["reviewed_videos"] += sign
+    for k in CORRECTION_COUNTS:
+        totals["corrections"][k] += sign * entry["corrections"].get(k, 0)
+    for k in SPEAKER_COUNTS:
+        totals["speakers"][k] += sign * entry["speakers"].get(k, 0)
+
+
+class ProgressRollup:
+    """Per-video progress entries with incrementally maintained folder and course totals."""
+
+    def __init__(self, base_dir, index_path=PROGRESS_INDEX_PATH):
+        self.base_dir = base_dir
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        # Serializes index writes so a snapshot is never replaced by an older one mid-write
+        self.save_lock = threading.Lock()
+        self.videos = {}
+        self.folders = {}
+        self.courses = {}
+        self.refreshed_at = None
+        self._save_timer = None
+        self._load()
+        atexit.register(self.flush)
+
+    # ----- Persistence -----
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.refreshed_at = data.get("refreshed_at")
+        for entry in data.get("videos", []):
+            self._put(entry)
+
+    def save(self):
+        """Write the index atomically."""
+        with self.save_lock:
+            with self.lock:
+                data = {
+                    "refreshed_at": self.refreshed_at,
+                    "videos": list(self.videos.values())
+                }
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.index_path)),
+                prefix=os.path.basename(self.index_path) + '.',
+                suffix='.tmp'
+            )
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def schedule_save(self):
+        """Write the index after PROGRESS_SAVE_DELAY, unless a write is already pending."""
+        with self.lock:
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(PROGRESS_SAVE_DELAY, self._scheduled_save)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def _scheduled_save(self):
+        # Cleared before the snapshot, so changes made during the write schedule another
+        with self.lock:
+            self._save_timer = None
+        try:
+            self.save()
+        except OSError:
+            pass  # The next refresh rebuilds anything that was not written
+
+    def flush(self):
+        """Write a pending scheduled save now (runs at exit)."""
+        with self.lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        try:
+            self.save()
+        except OSError:
+            pass
+
+    # ----- Entries -----
+
+    def _locate(self, video_path):
+        """Return (course, folder) labels for a video."""
+        video_dir = Path(video_path).parent
+        try:
+            rel = video_dir.relative_to(self.base_dir)
+            course = rel.parts[0] if rel.parts else video_dir.name
+        except ValueError:
+            course = video_dir.parent.name or video_dir.name
+        return course, str(video_dir)
+
+    def _put(self, entry):
+        """Insert or replace an entry, adjusting totals. Caller holds the lock (or is __init__)."""
+        old = self.videos.get(entry["video_path"])
+        if old:
+            _apply(self.folders[old["folder"]], old, -1)
+            _apply(self.courses[old["course"]], old, -1)
+        self.videos[entry["video_path"]] = entry
+        _apply(self.folders.setdefault(entry["folder"], _empty_totals()), entry, 1)
+        _apply(self.courses.setdefault(entry["course"], _empty_totals()), entry, 1)
+
+    def _remove(self, video_path):
+        old = self.videos.pop(video_path, None)
+        if old:
+            _apply(self.folders[old["folder"]], old, -1)
+            _apply(self.courses[old["course"]], old, -1)
+            if not self.folders[old["folder"]]["videos"]:
+                del self.folders[old["folder"]]
+            if not self.courses[old["course"]]["videos"]:
+                del self.courses[old["course"]]
+
+    def _make_entry(self, video_path, correction_stats, speaker_stats, reviewed_path=None, signature=None):
+        course, folder = self._locate(video_path)
+        return {
+            "video_path": str(video_path),
+            "video_name": Path(video_path).stem,
+            "course": course,
+            "folder": folder,
+            "has_reviewed": reviewed_path is not None,
+            "reviewed_path": str(reviewed_path) if reviewed_path else None,
+            "signature": signature,
+            "corrections": {k: correction_stats.get(k, 0) for k in CORRECTION_COUNTS},
+            "speakers": {k: speaker_stats.get(k, 0) for k in SPEAKER_COUNTS},
+            "updated_at": time.time()
+        }
+
+    def update_video(self, video_path, correction_stats, speaker_stats, reviewed_path):
+        """Record freshly saved statistics for one video (called from /api/save); the index is written later."""
+        signature = None
+        try:
+            stat = os.stat(reviewed_path)
+            signature = [stat.st_mtime, stat.st_size]
+        except OSError:
+            pass
+        entry = self._make_entry(video_path, correction_stats, speaker_stats, reviewed_path, signature)
+        with self.lock:
+            self._put(entry)
+        self.schedule_save()
+
+    # ----- Refresh from disk -----
+
+    def refresh(self, root, files, count_pending_corrections, progress=None):
+        """
+        Reconcile the rollup with the library on disk.
+
+        Args:
+            root: Directory that was scanned; entries under it that were not found are dropped,
+                as are entries elsewhere whose video no longer exists
+            files: Video records from find_video_folders(root)
+            count_pending_corrections: fn(corrections_path) -> correction stats for unreviewed videos
+            progress: Optional fn(done, total) called per video
+
+        Returns:
+            Number of videos whose entry was re-read
+        """
+        seen = set()
+        reread = 0
+
+        for i, record in enumerate(files):
+            if progress:
+                progress(i, len(files))
+
+            video_path = record["video_path"]
+            seen.add(video_path)
+            reviewed_path = Path(record["video_path"]).parent / "selected_ai_edits" / f"{record['video_name']}_reviewed.json"
+            source = reviewed_path if reviewed_path.exists() else Path(record["corrections_path"])
+
+            try:
+                stat = source.stat()
+            except OSError:
+                continue
+            signature = [stat.st_mtime, stat.st_size]
+
+            existing = self.videos.get(video_path)
+            if existing and existing.get("signature") == signature \
+                    and existing.get("has_reviewed") == (source == reviewed_path):
+                continue
+
+            try:
+                if source == reviewed_path:
+                    with open(reviewed_path, 'r', encoding='utf-8') as f:
+                        reviewed = json.load(f)
+                    entry = self._make_entry(video_path, reviewed.get("correction_statistics", {}),
+                                             reviewed.get("speaker_statistics", {}), reviewed_path, signature)
+                else:
+                    entry = self._make_entry(video_path, count_pending_corrections(source), {}, None, signature)
+            except (OSError, ValueError):
+                continue
+
+            with self.lock:
+                self._put(entry)
+            reread += 1
+
+        with self.lock:
+            unseen = [p for p in self.videos if p not in seen]
+        gone = [p for p in unseen if _is_under(p, root) or not os.path.exists(p)]
+
+        with self.lock:
+            for video_path in gone:
+                self._remove(video_path)
+            self.refreshed_at = time.time()
+
+        self.save()
+        return reread
+
+    def is_stale(self):
+        return self.refreshed_at is None or time.time() - self.refreshed_at > PROGRESS_REFRESH_SECONDS
+
+    # ----- Queries -----
+
+    def summary(self, level='course', prefix=None):
+        """
+        Progress totals from the rollup.
+
+        Args:
+            level: "course", "folder" or "video" breakdown
+            prefix: Only count videos under this directory (course rows are totalled
+                from those videos)
+
+        Returns:
+            Dict with overall totals and the requested breakdown
+        """
+        with self.lock:
+            if level == 'video':
+                rows = [
+                    {"key": e["video_path"], "course": e["course"], "folder": e["folder"],
+                     "has_reviewed": e["has_reviewed"], "corrections": dict(e["corrections"]),
+                     "speakers": dict(e["speakers"])}
+                    for e in self.videos.values()
+                    if not prefix or _is_under(e["video_path"], prefix)
+                ]
+            elif level == 'course' and prefix:
+                courses = {}
+                for e in self.videos.values():
+                    if _is_under(e["video_path"], prefix):
+                        _apply(courses.setdefault(e["course"], _empty_totals()), e, 1)
+                rows = [{"key": key, **totals} for key, totals in courses.items()]
+            else:
+                source = self.folders if level == 'folder' else self.courses
+                rows = []
+                for key, totals in source.items():
+                    if prefix and not _is_under(key, prefix):
+                        continue
+                    rows.append({"key": key, **copy.deepcopy(totals)})
+
+            overall = _empty_totals()
+            if prefix:
+                for e in self.videos.values():
+                    if _is_under(e["video_path"], prefix):
+                        _apply(overall, e, 1)
+            else:
+                for totals in self.courses.values():
+                    overall["videos"] += totals["videos"]
+                    overall["reviewed_videos"] += totals["reviewed_videos"]
+                    for k in CORRECTION_COUNTS:
+                        overall["corrections"][k] += totals["corrections"][k]
+                    for k in SPEAKER_COUNTS:
+                        overall["speakers"][k] += totals["speakers"][k]
+
+        rows.sort(key=lambda r: r["key"])
+        return {
+            "level": level,
+            "refreshed_at": self.refreshed_at,
+            "totals": overall,
+            "items": rows
+        }
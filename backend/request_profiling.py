@@ -0,0 +1,206 @@
+"""
+Opt-in per-request profiling.
+
+Set PROFILING=1 to make @profiled handlers profile a request when it
+carries an X-Profile: 1 header or falls within PROFILE_SAMPLE_RATE. Each
+capture stores cProfile pstats, flamegraph-ready collapsed stacks from a
+sampling thread, and a JSON record with the endpoint, video path and
+timing. With PROFILING unset, @profiled returns the handler unchanged, so
+there is no overhead at all.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+from flask import request
+
+PROFILING_ENABLED = os.environ.get('PROFILING') == '1'
+
+# Fraction of requests to profile without the header (0 = header only)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+
+# Where captures are stored, and how many are kept
+PROFILE_DIR = os.environ.get(
+    'PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+)
+PROFILE_MAX_COUNT = int(os.environ.get('PROFILE_MAX_COUNT', 200))
+
+# Request header that asks for a profile
+PROFILE_HEADER = 'X-Profile'
+
+# Stack sampling interval for the collapsed-stack output
+SAMPLE_INTERVAL_SECONDS = 0.002
+
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+# File suffix for each downloadable artifact
+PROFILE_ARTIFACTS = {
+    "pstats": ".pstats",
+    "collapsed": ".collapsed",
+    "json": ".json"
+}
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.counts = {}
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(SAMPLE_INTERVAL_SECONDS):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _should_profile():
+    if request.headers.get(PROFILE_HEADER) == '1':
+        return 'header'
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+
+def _request_video_path():
+    path = request.args.get('video') or request.args.get('path')
+    if not path and request.is_json:
+        path = (request.get_json(silent=True) or {}).get('video_path')
+    return path
+
+
+def _store(profiler, sampler, record):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, record["id"])
+
+    profiler.dump_stats(base + PROFILE_ARTIFACTS["pstats"])
+    with open(base + PROFILE_ARTIFACTS["collapsed"], 'w', encoding='utf-8') as f:
+        for stack, count in sorted(sampler.counts.items()):
+            f.write(f"{stack} {count}\n")
+    with open(base + PROFILE_ARTIFACTS["json"], 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2)
+
+    _prune()
+
+
+def _prune():
+    records = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith('.json'))
+    for name in records[:max(len(records) - PROFILE_MAX_COUNT, 0)]:
+        profile_id = name[:-len('.json')]
+        for suffix in PROFILE_ARTIFACTS.values():
+            try:
+                os.remove(os.path.join(PROFILE_DIR, profile_id + suffix))
+            except OSError:
+                pass
+
+
+def profiled(handler):
+    """Decorator for Flask handlers that may be profiled (no-op unless PROFILING=1)."""
+    if not PROFILING_ENABLED:
+        return handler
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        trigger = _should_profile()
+        if not trigger:
+            return handler(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler at a time; another request has it
+            return handler(*args, **kwargs)
+
+        sampler = _StackSampler(threading.get_ident())
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            sampler.start()
+            response = handler(*args, **kwargs)
+        finally:
+            profiler.disable()
+            if sampler.is_alive():
+                sampler.stop()
+
+        duration = time.perf_counter() - started
+        status = response[1] if isinstance(response, tuple) and len(response) > 1 else getattr(response, 'status_code', 200)
+        record = {
+            "id": time.strftime('%Y%m%dT%H%M%S', time.localtime(started_at)) + '-' + uuid.uuid4().hex[:8],
+            "endpoint": request.path,
+            "method": request.method,
+            "video_path": _request_video_path(),
+            "trigger": trigger,
+            "started_at": started_at,
+            "duration_ms": round(duration * 1000, 2),
+            "status": status,
+            "samples": sampler.samples
+        }
+        try:
+            _store(profiler, sampler, record)
+        except OSError:
+            pass
+        return response
+
+    return wrapper
+
+
+def list_profiles():
+    """Stored profile records, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    records = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name), 'r', encoding='utf-8') as f:
+                records.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def profile_artifact_path(profile_id, kind):
+    """Path of a stored artifact, or None if the id/kind is invalid or missing."""
+    if not PROFILE_ID_PATTERN.match(profile_id) or kind not in PROFILE_ARTIFACTS:
+        return None
+    path = os.path.join(PROFILE_DIR, profile_id + PROFILE_ARTIFACTS[kind])
+    return path if os.path.exists(path) else None
+
+
+def profile_summary(profile_id, limit=40):
+    """Text report of the top functions by cumulative time, or None if missing."""
+    path = profile_artifact_path(profile_id, 'pstats')
+    if not path:
+        return None
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,123 @@
+"""
+Filtered, cursor-paginated queries over corrections and speaker suggestions.
+
+Items are kept sorted by (time, id) with a per-status sorted index, so
+pages start with a bisect on the cursor (or the start of a time range),
+stop at the end of the range, and "next pending after t" is a single
+bisect instead of a scan.
+"""
+import bisect
+
+
+def encode_cursor(t, item_id):
+    return f"{t!r}:{item_id}"
+
+
+def decode_cursor(cursor):
+    """Parse a cursor from encode_cursor(); raises ValueError if malformed."""
+    t, _, item_id = cursor.rpartition(':')
+    return float(t), int(item_id)
+
+
+class ItemIndex:
+    """
+    Time-ordered index over review items.
+
+    Args:
+        items: Correction or suggestion dicts
+        time_key: Field holding the item's time in seconds
+        id_key: Field holding the item's integer id
+    """
+
+    def __init__(self, items, time_key, id_key):
+        self.time_key = time_key
+        self.id_key = id_key
+        self.items = sorted(items, key=self._sort_key)
+        self.keys = [self._sort_key(item) for item in self.items]
+
+        # status -> sorted list of (time, id, position)
+        self.by_status = {}
+        for pos, item in enumerate(self.items):
+            t, item_id = self.keys[pos]
+            self.by_status.setdefault(item.get('status'), []).append((t, item_id, pos))
+
+    def _sort_key(self, item):
+        t = item.get(self.time_key)
+        return (t if t is not None else 0.0, item.get(self.id_key) or 0)
+
+    def counts(self):
+        """Number of items per status."""
+        return {status: len(entries) for status, entries in self.by_status.items()}
+
+    def query(self, predicate=None, cursor=None, limit=50, statuses=None, start=None, end=None):
+        """
+        Get one page of matching items in time order.
+
+        Args:
+            predicate: Optional fn(item) -> bool for the non-status filters
+            cursor: Cursor from a previous page's next_cursor
+            limit: Maximum items to return
+            statuses: Optional set of statuses; walks only those status indexes
+            start: Optional earliest item time; the walk begins there
+            end: Optional latest item time; the walk stops after it
+
+        Returns:
+            Tuple of (items, next_cursor or None)
+        """
+        start_key = decode_cursor(cursor) if cursor else None
+
+        if statuses:
+            # Merge the per-status lists from the cursor (or range start) onwards
+            positions = []
+            for status in statuses:
+                entries = self.by_status.get(status, [])
+                lo = bisect.bisect_right(entries, (start_key[0], start_key[1], float('inf'))) if start_key else 0
+                if start is not None:
+                    lo = max(lo, bisect.bisect_left(entries, (start, float('-inf'), -1)))
+                positions.append((entries, lo))
+            candidates = self._merge(positions)
+        else:
+            lo = bisect.bisect_right(self.keys, start_key) if start_key else 0
+            if start is not None:
+                lo = max(lo, bisect.bisect_left(self.keys, (start, float('-inf'))))
+            candidates = range(lo, len(self.items))
+
+        page = []
+        last_pos = None
+        for pos in candidates:
+            if end is not None and self.keys[pos][0] > end:
+                break
+            item = self.items[pos]
+            if predicate and not predicate(item):
+                continue
+            if len(page) == limit:
+                # Another match exists, so hand back a cursor at the last returned item
+                return page, encode_cursor(*self.keys[last_pos])
+            page.append(item)
+            last_pos = pos
+
+        return page, None
+
+    def _merge(self, lists):
+        """Yield positions from several (entries, start) lists in time order."""
+        cursors = [[entries, i] for entries, i in lists if i < len(entries)]
+        while cursors:
+            best = min(cursors, key=lambda c: c[0][c[1]])
+            yield best[0][best[1]][2]
+            best[1] += 1
+            if best[1] >= len(best[0]):
+                cursors.remove(best)
+
+    def next_with_status(self, status, after, before=False):
+        """
+        Nearest item with the given status strictly after (or before) a time.
+
+        Returns:
+            The item or None
+        """
+        entries = self.by_status.get(status, [])
+        if before:
+            i = bisect.bisect_left(entries, (after, float('-inf'), -1)) - 1
+            return self.items[entries[i][2]] if i >= 0 else None
+        i = bisect.bisect_right(entries, (after, float('inf'), float('inf')))
+        return self.items[entries[i][2]] if i < len(entries) else None
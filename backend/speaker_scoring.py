@@ -0,0 +1,262 @@
+"""
+Windowed speaker-context scoring for UNKNOWN transcript segments.
+
+Looks past the immediate neighbours of an UNKNOWN segment so runs of
+consecutive UNKNOWN sentences still get useful candidate speakers.
+"""
+import bisect
+import math
+
+# Number of sentences on each side of a segment considered for context
+DEFAULT_CONTEXT_WINDOW = 5
+
+# Time constant (seconds) for decaying the influence of the nearest known speaker
+GAP_DECAY_SECONDS = 5.0
+
+# Relative weights of the three scoring signals
+TALK_TIME_WEIGHT = 0.45
+TURN_COUNT_WEIGHT = 0.25
+PROXIMITY_WEIGHT = 0.30
+
+
+def is_unknown_speaker(speaker):
+    """Return True if the speaker label marks an UNKNOWN segment."""
+    return 'UNKNOWN' in (speaker or '').upper()
+
+
+class SpeakerContextIndex:
+    """
+    Precomputed speaker context for a list of transcript sentences.
+
+    Building the index is a single O(n) pass that records, per known speaker,
+    the positions of that speaker's sentences with prefix sums of talk time and
+    turn starts over them, plus the nearest known-speaker sentence on each side
+    of every position. Each speaker's arrays only grow at that speaker's own
+    sentences, so time and memory stay O(n) however many speakers there are.
+    Window queries bisect the position list, so scoring a segment is
+    O(speakers * log n) regardless of window size.
+    """
+
+    def __init__(self, sentences):
+        n = len(sentences)
+        self.size = n
+        self.speakers = []
+        self.starts = []
+        self.ends = []
+
+        for s in sentences:
+            self.speakers.append(s.get('speaker', '') or '')
+            self.starts.append(s.get('start') or 0)
+            self.ends.append(s.get('end') or 0)
+
+        known = sorted(set(sp for sp in self.speakers if sp and not is_unknown_speaker(sp)))
+        self.known_speakers = known
+
+        # Per speaker: its sentence positions, and prefix sums over them where
+        # the value at [k] covers that speaker's first k sentences
+        self.positions = {sp: [] for sp in known}
+        self.talk_prefix = {sp: [0.0] for sp in known}
+        self.turn_prefix = {sp: [0] for sp in known}
+        self.prev_known = [-1] * n
+        self.next_known = [-1] * n
+
+        last_known = -1
+        for i in range(n):
+            speaker = self.speakers[i]
+            self.prev_known[i] = last_known
+            if speaker not in self.positions:
+                continue
+
+            is_new_turn = i == 0 or self.speakers[i - 1] != speaker
+            talk = self.talk_prefix[speaker]
+            turns = self.turn_prefix[speaker]
+            self.positions[speaker].append(i)
+            talk.append(talk[-1] + max(self.ends[i] - self.starts[i], 0))
+            turns.append(turns[-1] + (1 if is_new_turn else 0))
+            last_known = i
+
+        last_known = -1
+        for i in range(n - 1, -1, -1):
+            self.next_known[i] = last_known
+            if self.speakers[i] in self.positions:
+                last_known = i
+
+    def _window_bounds(self, speaker, lo, hi):
+        positions = self.positions[speaker]
+        return bisect.bisect_left(positions, lo), bisect.bisect_left(positions, hi)
+
+    def window_talk(self, speaker, lo, hi):
+        """Talk time of a known speaker over sentences [lo, hi)."""
+        a, b = self._window_bounds(speaker, lo, hi)
+        return self.talk_prefix[speaker][b] - self.talk_prefix[speaker][a]
+
+    def window_turns(self, speaker, lo, hi):
+        """Turns started by a known speaker over sentences [lo, hi)."""
+        a, b = self._window_bounds(speaker, lo, hi)
+        return self.turn_prefix[speaker][b] - self.turn_prefix[speaker][a]
+
+    def nearest_known_positions(self, i):
+        """Positions of the nearest known-speaker sentences before and after i (-1 if none)."""
+        return self.prev_known[i], self.next_known[i]
+
+    def nearest_known(self, i):
+        """
+        Get the nearest known-speaker sentences on each side of position i.
+
+        Returns:
+            Tuple of (prev_speaker, gap_before, next_speaker, gap_after); speakers
+            are None and gaps are None when there is no known sentence on that side
+        """
+        prev_idx, next_idx = self.nearest_known_positions(i)
+
+        prev_speaker = gap_before = None
+        if prev_idx >= 0:
+            prev_speaker = self.speakers[prev_idx]
+            gap_before = max(self.starts[i] - self.ends[prev_idx], 0)
+
+        next_speaker = gap_after = None
+        if next_idx >= 0:
+            next_speaker = self.speakers[next_idx]
+            gap_after = max(self.starts[next_idx] - self.ends[i], 0)
+
+        return prev_speaker, gap_before, next_speaker, gap_after
+
+    def score(self, i, window=DEFAULT_CONTEXT_WINDOW):
+        """
+        Rank candidate speakers for the sentence at position i.
+
+        Args:
+            i: Index of the sentence to score
+            window: Number of sentences on each side to include as context
+
+        Returns:
+            List of {"speaker", "score"} dicts sorted by descending score.
+            Scores are normalized to sum to 1; empty if no known speaker is nearby.
+        """
+        lo = max(i - window, 0)
+        hi = min(i + window + 1, self.size)
+
+        talk = {}
+        turns = {}
+        for sp in self.known_speakers:
+            talk[sp] = self.window_talk(sp, lo, hi)
+            turns[sp] = self.window_turns(sp, lo, hi)
+
+        proximity = {}
+        prev_speaker, gap_before, next_speaker, gap_after = self.nearest_known(i)
+        if prev_speaker is not None:
+            proximity[prev_speaker] = proximity.get(prev_speaker, 0.0) + math.exp(-gap_before / GAP_DECAY_SECONDS)
+        if next_speaker is not None:
+            proximity[next_speaker] = proximity.get(next_speaker, 0.0) + math.exp(-gap_after / GAP_DECAY_SECONDS)
+
+        total_talk = sum(talk.values())
+        total_turns = sum(turns.values())
+        total_proximity = sum(proximity.values())
+
+        raw = {}
+        for sp in self.known_speakers:
+            value = 0.0
+            if total_talk > 0:
+                value += TALK_TIME_WEIGHT * talk[sp] / total_talk
+            if total_turns > 0:
+                value += TURN_COUNT_WEIGHT * turns[sp] / total_turns
+            if total_proximity > 0:
+                value += PROXIMITY_WEIGHT * proximity.get(sp, 0.0) / total_proximity
+            if value > 1e-9:  # ignore floating-point residue from incremental updates
+                raw[sp] = value
+
+        total = sum(raw.values())
+        if total <= 0:
+            return []
+
+        ranked = sorted(raw.items(), key=lambda item: (-item[1], item[0]))
+        return [{"speaker": sp, "score": round(value / total, 3)} for sp, value in ranked]
+
+
+class IncrementalSpeakerContext(SpeakerContextIndex):
+    """
+    Speaker context that supports reassigning sentences after it is built.
+
+    Queries start from the static index of the speakers it was built with
+    and correct for the sentences reassigned since, which are kept in a
+    sorted list. Only reassigned sentences inside a window (and the turn
+    starts next to them) are revisited, so memory stays O(n) however many
+    speakers there are, and set_speaker() is a bisect plus a list insert.
+    """
+
+    def __init__(self, sentences):
+        super().__init__(sentences)
+        self.base_speakers = list(self.speakers)
+        self.changed = []
+        self.known_positions = [i for i in range(self.size) if self.speakers[i] in self.positions]
+
+        # Superseded by known_positions, which stays current across reassignments
+        self.prev_known = self.next_known = None
+
+    def _is_turn_start(self, i):
+        return i == 0 or self.speakers[i - 1] != self.speakers[i]
+
+    def _was_turn_start(self, i):
+        return i == 0 or self.base_speakers[i - 1] != self.base_speakers[i]
+
+    def set_speaker(self, i, speaker):
+        """Reassign sentence i; UNKNOWN labels remove it from the known-speaker context."""
+        speaker = speaker or ''
+        if self.speakers[i] == speaker:
+            return
+
+        was_known = self.speakers[i] in self.known_speakers
+        self.speakers[i] = speaker
+        is_known = bool(speaker) and not is_unknown_speaker(speaker)
+        if is_known and speaker not in self.known_speakers:
+            self.known_speakers = sorted(self.known_speakers + [speaker])
+
+        k = bisect.bisect_left(self.changed, i)
+        present = k < len(self.changed) and self.changed[k] == i
+        if speaker != self.base_speakers[i] and not present:
+            self.changed.insert(k, i)
+        elif speaker == self.base_speakers[i] and present:
+            del self.changed[k]
+
+        if was_known and not is_known:
+            del self.known_positions[bisect.bisect_left(self.known_positions, i)]
+        elif is_known and not was_known:
+            bisect.insort(self.known_positions, i)
+
+    def window_talk(self, speaker, lo, hi):
+        total = super().window_talk(speaker, lo, hi) if speaker in self.positions else 0.0
+        a = bisect.bisect_left(self.changed, lo)
+        b = bisect.bisect_left(self.changed, hi)
+        for j in self.changed[a:b]:
+            talk = max(self.ends[j] - self.starts[j], 0)
+            if self.speakers[j] == speaker:
+                total += talk
+            if self.base_speakers[j] == speaker:
+                total -= talk
+        return total
+
+    def window_turns(self, speaker, lo, hi):
+        total = super().window_turns(speaker, lo, hi) if speaker in self.positions else 0
+
+        # Reassigning sentence j can change whether j and j+1 start a turn
+        a = bisect.bisect_left(self.changed, lo - 1)
+        b = bisect.bisect_left(self.changed, hi)
+        last = -1
+        for c in self.changed[a:b]:
+            for j in (c, c + 1):
+                if j <= last or j < lo or j >= hi:
+                    continue
+                last = j
+                if self.speakers[j] == speaker and self._is_turn_start(j):
+                    total += 1
+                if self.base_speakers[j] == speaker and self._was_turn_start(j):
+                    total -= 1
+        return total
+
+    def nearest_known_positions(self, i):
+        k = bisect.bisect_left(self.known_positions, i)
+        prev_idx = self.known_positions[k - 1] if k > 0 else -1
+        if k < len(self.known_positions) and self.known_positions[k] == i:
+            k += 1
+        next_idx = self.known_positions[k] if k < len(self.known_positions) else -1
+        return prev_idx, next_idx
@@ -0,0 +1,121 @@
+"""
+Run-length-encoded speaker timeline.
+
+Collapses a transcript into contiguous speaker turns (speaker, start, end,
+sentence range) so the frontend can draw a timeline or minimap without
+walking every sentence. Turn boundaries are kept as a sorted list of run
+start positions, so reassigning one sentence only re-checks the two
+boundaries around it instead of rebuilding the runs.
+"""
+import bisect
+import json
+import uuid
+
+from speaker_scoring import is_unknown_speaker
+
+# Column order of each row in the payload's "runs"
+TIMELINE_FIELDS = ["speaker", "start", "end", "first_sentence", "last_sentence", "unknown"]
+
+
+class SpeakerTimeline:
+    """
+    Speaker turns over a list of transcript sentences.
+
+    Args:
+        sentences: Transcript sentences (dicts with start, end, speaker)
+    """
+
+    def __init__(self, sentences):
+        self.speakers = [s.get('speaker', '') or '' for s in sentences]
+        self.starts = [s.get('start') for s in sentences]
+        self.ends = [s.get('end') for s in sentences]
+        self.size = len(self.speakers)
+        self.run_starts = [i for i in range(self.size) if self._is_boundary(i)]
+
+        # Identifies this timeline across reloads; version counts edits since
+        self.token = uuid.uuid4().hex[:8]
+        self.version = 0
+        self._payload = None
+
+    def _is_boundary(self, i):
+        return i == 0 or self.speakers[i] != self.speakers[i - 1]
+
+    def set_speaker(self, i, speaker):
+        """
+        Reassign sentence i, splitting or merging the runs around it.
+
+        Returns:
+            True if the timeline changed
+        """
+        speaker = speaker or ''
+        if self.speakers[i] == speaker:
+            return False
+
+        self.speakers[i] = speaker
+        for j in (i, i + 1):
+            if j >= self.size:
+                continue
+            k = bisect.bisect_left(self.run_starts, j)
+            present = k < len(self.run_starts) and self.run_starts[k] == j
+            if self._is_boundary(j) and not present:
+                self.run_starts.insert(k, j)
+            elif present and not self._is_boundary(j):
+                del self.run_starts[k]
+
+        self.version += 1
+        self._payload = None
+        return True
+
+    def runs(self):
+        """All runs as dicts, in transcript order."""
+        runs = []
+        for k, first in enumerate(self.run_starts):
+            last = self.run_starts[k + 1] - 1 if k + 1 < len(self.run_starts) else self.size - 1
+            speaker = self.speakers[first]
+            runs.append({
+                "speaker": speaker,
+                "start": self.starts[first],
+                "end": self.ends[last],
+                "first_sentence": first,
+                "last_sentence": last,
+                "unknown": is_unknown_speaker(speaker)
+            })
+        return runs
+
+    def etag(self):
+        return f'"{self.token}-{self.version}"'
+
+    def payload(self):
+        """
+        Compact JSON encoding of the timeline, cached until the next change.
+
+        Speakers are stored once in "speakers" and referenced by index; each
+        run is a row in TIMELINE_FIELDS order with unknown as 0/1.
+        """
+        if self._payload is not None:
+            return self._payload
+
+        speaker_codes = []
+        code_index = {}
+        rows = []
+        unknown_runs = 0
+        for run in self.runs():
+            speaker = run["speaker"]
+            if speaker not in code_index:
+                code_index[speaker] = len(speaker_codes)
+                speaker_codes.append(speaker)
+            rows.append([
+                code_index[speaker], run["start"], run["end"],
+                run["first_sentence"], run["last_sentence"], int(run["unknown"])
+            ])
+            unknown_runs += run["unknown"]
+
+        self._payload = json.dumps({
+            "version": self.version,
+            "sentence_count": self.size,
+            "unknown_runs": unknown_runs,
+            "speakers": speaker_codes,
+            "fields": TIMELINE_FIELDS,
+            "runs": rows
+        }, separators=(',', ':'))
+        return self._payload
@@ -0,0 +1,245 @@
+"""
+Incremental UNKNOWN speaker suggestions.
+
+Keeps per-transcript suggestion state between requests. When a reviewer
+decides a segment, only the suggestions whose context actually changed
+are rebuilt: segments within the scoring window, plus the run of UNKNOWN
+segments on each side whose nearest known speaker moved. The speaker
+timeline is kept in step with every reassignment.
+"""
+import threading
+
+from speaker_scoring import DEFAULT_CONTEXT_WINDOW, IncrementalSpeakerContext, is_unknown_speaker
+from speaker_timeline import SpeakerTimeline
+
+# Fields carried over from the reviewer's decision rather than recomputed
+DECISION_FIELDS = ('status', 'decision', 'assigned_speaker')
+
+
+class SuggestionEngine:
+    """
+    Suggestion state for one transcript.
+
+    Args:
+        sentences: Transcript sentences (dicts with id, text, start, end, speaker)
+        build_suggestion: fn(sentences, i, context_index, context_window) -> suggestion dict
+        context_window: Number of sentences on each side used for candidate scoring
+        decisions: Optional saved speaker decisions (sentence_id, decision, assigned_speaker, status)
+        splits: Optional saved segment splits (sentence_id, new_speaker)
+    """
+
+    def __init__(self, sentences, build_suggestion, context_window=DEFAULT_CONTEXT_WINDOW, decisions=None,
+                 splits=None):
+        self.build_suggestion = build_suggestion
+        self.context_window = context_window
+        self.lock = threading.Lock()
+
+        # Bumped whenever a suggestion changes, so derived indexes know to rebuild
+        self.version = 0
+
+        # Working copy whose speakers reflect decisions applied so far
+        self.sentences = [
+            {
+                "id": s.get('id', i),
+                "text": s.get('text', ''),
+                "start": s.get('start'),
+                "end": s.get('end'),
+                "speaker": s.get('speaker', '')
+            }
+            for i, s in enumerate(sentences)
+        ]
+        self.original_speakers = [s["speaker"] for s in self.sentences]
+        self.position_by_id = {s["id"]: i for i, s in enumerate(self.sentences)}
+
+        # position -> speaker from segment splits; these take precedence over decisions
+        self.splits = self._split_map(splits)
+
+        # Saved decisions and splits are applied to the speakers before anything is
+        # built, so replaying them costs one build rather than a rebuild per entry
+        saved = self._saved_decisions(decisions)
+        for pos, fields in saved.items():
+            if fields["decision"] and fields["assigned_speaker"]:
+                self.sentences[pos]["speaker"] = fields["assigned_speaker"]
+        for pos, speaker in self.splits.items():
+            self.sentences[pos]["speaker"] = speaker
+
+        self.context = IncrementalSpeakerContext(self.sentences)
+        self.timeline = SpeakerTimeline(self.sentences)
+
+        self.suggestions = {}
+        for i, speaker in enumerate(self.original_speakers):
+            if not is_unknown_speaker(speaker):
+                continue
+            if i in saved or i in self.splits:
+                self.suggestions[i] = self._build_undecided(i)
+                self.suggestions[i].update(saved.get(i, {}))
+            else:
+                self.suggestions[i] = build_suggestion(self.sentences, i, self.context, context_window)
+
+    def _saved_decisions(self, decisions):
+        """Map position -> decision fields for saved non-pending decisions on UNKNOWN segments."""
+        saved = {}
+        for d in decisions or []:
+            pos = self.position_by_id.get(d.get('sentence_id'))
+            if pos is None or not is_unknown_speaker(self.original_speakers[pos]):
+                continue
+            status = d.get('status', 'pending')
+            if status == 'pending':
+                saved.pop(pos, None)
+                continue
+            saved[pos] = {"status": status, "decision": d.get('decision'), "assigned_speaker": d.get('assigned_speaker')}
+        return saved
+
+    def _split_map(self, segment_splits):
+        """Map position -> speaker for a list of {sentence_id, new_speaker} markers."""
+        splits = {}
+        for split in segment_splits or []:
+            pos = self.position_by_id.get(split.get('sentence_id'))
+            if pos is not None and split.get('new_speaker'):
+                splits[pos] = split.get('new_speaker')
+        return splits
+
+    def split_markers(self):
+        """Current segment splits as {sentence_id, new_speaker} markers, in transcript order."""
+        return [
+            {"sentence_id": self.sentences[pos]["id"], "new_speaker": speaker}
+            for pos, speaker in sorted(self.splits.items())
+        ]
+
+    def _build_undecided(self, pos):
+        """Build pos's suggestion as if it still had its original speaker, in the current context."""
+        current = self.sentences[pos]["speaker"]
+        original = self.original_speakers[pos]
+        if current != original:
+            self.sentences[pos]["speaker"] = original
+            self.context.set_speaker(pos, original)
+        try:
+            return self.build_suggestion(self.sentences, pos, self.context, self.context_window)
+        finally:
+            if current != original:
+                self.sentences[pos]["speaker"] = current
+                self.context.set_speaker(pos, current)
+
+    def all_suggestions(self):
+        """All suggestions in transcript order."""
+        return [self.suggestions[i] for i in sorted(self.suggestions)]
+
+    def _affected_positions(self, pos):
+        """Positions whose suggestion can change when sentence pos is reassigned."""
+        n = len(self.sentences)
+        reach = self.context_window + 1
+        affected = set(range(max(pos - reach, 0), min(pos + reach + 1, n)))
+
+        # Runs of UNKNOWN segments whose nearest known speaker is pos
+        j = pos - 1
+        while j >= 0 and is_unknown_speaker(self.sentences[j]["speaker"]):
+            affected.add(j)
+            j -= 1
+        j = pos + 1
+        while j < n and is_unknown_speaker(self.sentences[j]["speaker"]):
+            affected.add(j)
+            j += 1
+
+        return affected
+
+    def apply_decision(self, sentence_id, decision=None, assigned_speaker=None, status='decided'):
+        """
+        Record a reviewer decision and rebuild the affected suggestions.
+
+        A decision with an assigned known speaker reassigns the segment, which
+        changes the context of its neighbours. Passing status "pending" undoes
+        a previous decision.
+
+        Returns:
+            List of suggestions that changed (including the decided one), or
+            None if the sentence has no suggestion
+        """
+        pos = self.position_by_id.get(sentence_id)
+        if pos is None or pos not in self.suggestions:
+            return None
+
+        suggestion = self.suggestions[pos]
+        before = {field: suggestion.get(field) for field in DECISION_FIELDS}
+        if status == 'pending':
+            decision = assigned_speaker = None
+        suggestion.update({"status": status, "decision": decision, "assigned_speaker": assigned_speaker})
+        changed = {}
+        if any(suggestion.get(field) != before[field] for field in DECISION_FIELDS):
+            changed[pos] = suggestion
+
+        self._update_speaker(pos, changed)
+
+        # Neighbours may have moved while this was decided, so an undone
+        # suggestion is rebuilt against the current context
+        if status == 'pending' and before["status"] != 'pending':
+            rebuilt = self.build_suggestion(self.sentences, pos, self.context, self.context_window)
+            if rebuilt != suggestion:
+                self.suggestions[pos] = rebuilt
+                changed[pos] = rebuilt
+
+        if changed:
+            self.version += 1
+        return [changed[i] for i in sorted(changed)]
+
+    def apply_split(self, sentence_id, new_speaker):
+        """
+        Record (or clear, with new_speaker None) a segment split reassigning one sentence.
+
+        Returns:
+            List of suggestions that changed, or None if the sentence is unknown
+        """
+        pos = self.position_by_id.get(sentence_id)
+        if pos is None:
+            return None
+
+        if new_speaker:
+            self.splits[pos] = new_speaker
+        else:
+            self.splits.pop(pos, None)
+
+        changed = {}
+        self._update_speaker(pos, changed)
+        if changed:
+            self.version += 1
+        return [changed[i] for i in sorted(changed)]
+
+    def set_splits(self, segment_splits):
+        """Replace all segment splits with a saved list of {sentence_id, new_speaker} markers."""
+        wanted = self._split_map(segment_splits)
+        changed = {}
+        touched = set(self.splits) | set(wanted)
+        self.splits = wanted
+        for pos in sorted(touched):
+            self._update_speaker(pos, changed)
+        if changed:
+            self.version += 1
+        return [changed[i] for i in sorted(changed)]
+
+    def _update_speaker(self, pos, changed):
+        """Bring sentence pos in line with its split, decision or original speaker."""
+        suggestion = self.suggestions.get(pos)
+        if pos in self.splits:
+            new_speaker = self.splits[pos]
+        elif suggestion and suggestion.get("decision") and suggestion.get("assigned_speaker"):
+            new_speaker = suggestion["assigned_speaker"]
+        else:
+            new_speaker = self.original_speakers[pos]
+
+        if new_speaker != self.sentences[pos]["speaker"]:
+            self._reassign(pos, new_speaker, changed)
+
+    def _reassign(self, pos, new_speaker, changed):
+        """Move sentence pos to a new speaker and rebuild neighbouring suggestions into `changed`."""
+        self.sentences[pos]["speaker"] = new_speaker
+        self.context.set_speaker(pos, new_speaker)
+        self.timeline.set_speaker(pos, new_speaker)
+
+        for i in sorted(self._affected_positions(pos)):
+            old = self.suggestions.get(i)
+            if old is None or i == pos or old.get("status") != 'pending':
+                continue
+            rebuilt = self.build_suggestion(self.sentences, i, self.context, self.context_window)
+            rebuilt.update({field: old.get(field) for field in DECISION_FIELDS})
+            if rebuilt != old:
+                self.suggestions[i] = rebuilt
+                changed[i] = rebuilt
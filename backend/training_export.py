@@ -0,0 +1,154 @@
+"""
+Context-rich training export.
+
+Joins each reviewed text change with its sentence, neighbouring sentences,
+speaker name and aligned word timings in a single pass over the transcript.
+"""
+from collections import deque
+
+# Default number of neighbouring sentences included on each side
+DEFAULT_EXPORT_WINDOW = 2
+
+_STRIP_CHARS = ".,!?;:'\""
+
+
+def reviewed_text_changes(reviewed):
+    """
+    Get the text changes from a _reviewed.json document.
+
+    Reads the `text_changes` list written by /api/save, falling back to the
+    older `corrections` list (with `final` instead of `corrected`).
+
+    Returns:
+        List of {"id", "sentence_id", "original", "corrected", "status"} dicts
+        with an actual change
+    """
+    changes = []
+    if 'text_changes' in reviewed:
+        for change in reviewed.get('text_changes', []):
+            if change.get('corrected') and change.get('original') != change.get('corrected'):
+                changes.append(change)
+    else:
+        for corr in reviewed.get('corrections', []):
+            if corr.get('status') in ('accepted', 'rejected') and corr.get('final'):
+                if corr.get('original') != corr.get('final'):
+                    changes.append({
+                        "id": corr.get('id'),
+                        "sentence_id": corr.get('sentence_id'),
+                        "original": corr.get('original'),
+                        "corrected": corr.get('final'),
+                        "status": corr.get('status')
+                    })
+    return changes
+
+
+def _normalize(word):
+    return word.lower().strip().strip(_STRIP_CHARS)
+
+
+def align_word_span(words, original):
+    """
+    Find the word-time span covering `original` within a sentence's words.
+
+    Returns:
+        Dict with word_start/word_end indices and start/end times, or None if
+        the text cannot be aligned
+    """
+    target = [_normalize(w) for w in original.split()]
+    target = [w for w in target if w]
+    if not target or not words:
+        return None
+
+    normalized = [_normalize(w.get('word', '')) for w in words]
+    last = len(normalized) - len(target)
+    for i in range(last + 1):
+        if normalized[i:i + len(target)] == target:
+            j = i + len(target) - 1
+            return {
+                "word_start": i,
+                "word_end": j,
+                "start": words[i].get('start'),
+                "end": words[j].get('end')
+            }
+    return None
+
+
+def _sentence_words(sentence):
+    if hasattr(sentence, 'words'):
+        return sentence.words()
+    words = []
+    for orig in sentence.get('original_sentences', []):
+        words.extend(orig.get('words', []))
+    return words
+
+
+def iter_context_records(sentences, changes, speaker_names=None, speaker_decisions=None,
+                         window=DEFAULT_EXPORT_WINDOW):
+    """
+    Yield one training record per text change, in transcript order.
+
+    Changes are indexed by sentence_id up front, so the transcript is walked
+    once. Each record is emitted as soon as `window` following sentences have
+    been seen, keeping only a sliding window of sentences in memory.
+
+    Args:
+        sentences: Iterable of transcript sentences (parsed dicts or compact Sentence objects)
+        changes: Text changes from reviewed_text_changes()
+        speaker_names: Dict mapping speaker IDs to names
+        speaker_decisions: UNKNOWN speaker decisions; assigned speakers override the transcript
+        window: Number of neighbouring sentences on each side to include
+    """
+    speaker_names = speaker_names or {}
+
+    changes_by_sentence = {}
+    for change in changes:
+        changes_by_sentence.setdefault(change.get('sentence_id'), []).append(change)
+
+    assigned = {}
+    for decision in speaker_decisions or []:
+        if decision.get('decision') and decision.get('assigned_speaker'):
+            assigned[decision.get('sentence_id')] = decision.get('assigned_speaker')
+
+    previous = deque(maxlen=window)
+    pending = []  # [record, remaining following sentences needed]
+
+    for i, sentence in enumerate(sentences):
+        sentence_id = sentence.get('id', i)
+        text = sentence.get('text', '')
+
+        # Feed this sentence to records still collecting following context
+        for item in pending:
+            item[0]["context_after"].append(text)
+            item[1] -= 1
+        while pending and pending[0][1] <= 0:
+            yield pending.pop(0)[0]
+
+        sentence_changes = changes_by_sentence.get(sentence_id)
+        if sentence_changes:
+            speaker = assigned.get(sentence_id, sentence.get('speaker', ''))
+            words = _sentence_words(sentence)
+            for change in sentence_changes:
+                record = {
+                    "id": change.get('id'),
+                    "original": change.get('original'),
+                    "corrected": change.get('corrected'),
+                    "status": change.get('status'),
+                    "sentence_id": sentence_id,
+                    "sentence": text,
+                    "context_before": list(previous),
+                    "context_after": [],
+                    "speaker": speaker,
+                    "speaker_name": speaker_names.get(speaker, speaker),
+                    "sentence_start": sentence.get('start'),
+                    "sentence_end": sentence.get('end'),
+                    "word_span": align_word_span(words, change.get('original') or '')
+                }
+                if window > 0:
+                    pending.append([record, window])
+                else:
+                    yield record
+
+        previous.append(text)
+
+    for item in pending:
+        yield item[0]
@@ -0,0 +1,179 @@
+"""
+Compact in-memory transcript model.
+
+A _v7.json transcript parsed with json.load keeps every word as its own
+dict, which costs a few hundred bytes per word. This model keeps sentence
+headers in __slots__ objects and stores word timings and text as flat
+array columns shared by the whole transcript, so a backend can keep many
+more videos cached.
+
+Sentences expose a read-only dict-like interface (get, keys, [] access) so
+the existing transcript helpers work on them unchanged.
+"""
+import json
+import math
+from array import array
+
+# Sentence-level keys stored as slots; anything else is kept in Sentence.extra
+SENTENCE_FIELDS = ('id', 'text', 'start', 'end', 'speaker', 'was_unknown')
+
+
+class Sentence:
+    """One transcript sentence whose words live in the owning transcript's columns."""
+
+    __slots__ = ('id', 'text', 'start', 'end', 'speaker', 'was_unknown',
+                 'word_lo', 'word_hi', 'segments', 'extra', 'transcript')
+
+    def __init__(self, transcript, data, word_lo, word_hi, segments):
+        self.transcript = transcript
+        self.id = data.get('id')
+        self.text = data.get('text')
+        self.start = data.get('start')
+        self.end = data.get('end')
+        self.speaker = data.get('speaker')
+        self.was_unknown = data.get('was_unknown')
+        self.word_lo = word_lo
+        self.word_hi = word_hi
+        self.segments = segments
+
+        extra = {k: v for k, v in data.items() if k not in SENTENCE_FIELDS and k != 'original_sentences'}
+        self.extra = extra or None
+
+    def words(self):
+        """Return this sentence's words as {"word", "start", "end"} dicts."""
+        return self.transcript.words(self.word_lo, self.word_hi)
+
+    def original_sentences(self):
+        """Rebuild the original_sentences list with word dicts, as stored in _v7.json."""
+        rebuilt = []
+        for meta, lo, hi in self.segments:
+            segment = dict(meta) if meta else {}
+            segment['words'] = self.transcript.words(lo, hi)
+            rebuilt.append(segment)
+        return rebuilt
+
+    def keys(self):
+        present = [k for k in SENTENCE_FIELDS if getattr(self, k) is not None]
+        if self.segments:
+            present.append('original_sentences')
+        if self.extra:
+            present.extend(self.extra)
+        return present
+
+    def __getitem__(self, key):
+        if key in SENTENCE_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if key == 'original_sentences' and self.segments:
+            return self.original_sentences()
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class CompactTranscript:
+    """
+    Struct-of-arrays transcript.
+
+    Word data is held in three parallel columns: word_starts and word_ends
+    (float64, NaN for missing times) and word_text (indices into vocab, so
+    repeated words are stored once).
+    """
+
+    __slots__ = ('sentences', 'word_starts', 'word_ends', 'word_text', 'vocab', 'extra')
+
+    def __init__(self):
+        self.sentences = []
+        self.word_starts = array('d')
+        self.word_ends = array('d')
+        self.word_text = array('I')
+        self.vocab = []
+        self.extra = None
+
+    @classmethod
+    def from_v7(cls, data):
+        """Convert a parsed _v7.json document into the compact model."""
+        transcript = cls()
+        vocab_index = {}
+        nan = float('nan')
+
+        for s in data.get('sentences', []):
+            sentence_lo = len(transcript.word_text)
+            segments = []
+            for orig in s.get('original_sentences', []):
+                lo = len(transcript.word_text)
+                for w in orig.get('words', []):
+                    word = w.get('word', '')
+                    idx = vocab_index.get(word)
+                    if idx is None:
+                        idx = vocab_index[word] = len(transcript.vocab)
+                        transcript.vocab.append(word)
+                    start = w.get('start')
+                    end = w.get('end')
+                    transcript.word_text.append(idx)
+                    transcript.word_starts.append(nan if start is None else start)
+                    transcript.word_ends.append(nan if end is None else end)
+                meta = {k: v for k, v in orig.items() if k != 'words'}
+                segments.append((meta or None, lo, len(transcript.word_text)))
+
+            transcript.sentences.append(
+                Sentence(transcript, s, sentence_lo, len(transcript.word_text), tuple(segments))
+            )
+
+        extra = {k: v for k, v in data.items() if k != 'sentences'}
+        transcript.extra = extra or None
+        return transcript
+
+    def words(self, lo, hi):
+        """Materialize words [lo, hi) as {"word", "start", "end"} dicts."""
+        vocab = self.vocab
+        starts = self.word_starts
+        ends = self.word_ends
+        text = self.word_text
+        result = []
+        for k in range(lo, hi):
+            start = starts[k]
+            end = ends[k]
+            result.append({
+                "word": vocab[text[k]],
+                "start": None if math.isnan(start) else start,
+                "end": None if math.isnan(end) else end
+            })
+        return result
+
+    def get(self, key, default=None):
+        if key == 'sentences':
+            return self.sentences
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return default
+
+    def __contains__(self, key):
+        return key == 'sentences' or bool(self.extra and key in self.extra)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.get(key)
+
+
+def load_compact_transcript(path):
+    """Read a _v7.json file straight into a CompactTranscript."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return CompactTranscript.from_v7(data)
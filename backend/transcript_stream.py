@@ -0,0 +1,279 @@
+"""
+Streaming reader for _v7.json transcripts.
+
+json.load builds every original_sentences[].words[] dict even when only
+sentence headers are needed. This reader walks the file in fixed-size
+chunks and yields one sentence at a time with just the requested fields.
+Word arrays it was not asked for are skipped by bracket matching over the
+raw text, without being parsed. Scalar values and any requested word
+arrays still go through the C JSON decoder.
+
+Only the current chunk and the current sentence are held in memory, so
+callers that consume the iterator as they go run in constant memory.
+"""
+import json
+import re
+
+# Fields most callers want: everything /api/load sends per sentence
+HEADER_FIELDS = ('id', 'text', 'start', 'end', 'speaker', 'was_unknown')
+
+# Characters read per chunk
+STREAM_CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_NUMBER_LOOKAHEAD = 64
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_CLOSERS = {'[': ']', '{': '}'}
+_STRING_SPECIALS = re.compile(r'["\\]')
+_WORDS_KEY = re.compile(r'"original_sentences"\s*:')
+
+
+def _string_state(buf, lo, hi, in_string, escaped):
+    """
+    Track whether the scanner is inside a JSON string after reading buf[lo:hi].
+
+    Returns:
+        Tuple of (in_string, escaped) at the end of the range
+    """
+    if not escaped and buf.find('\\', lo, hi) < 0:
+        # No escapes, so every quote opens or closes a string
+        return in_string != bool(buf.count('"', lo, hi) & 1), False
+
+    segment = buf[lo:hi]
+    i = 0
+    for m in _STRING_SPECIALS.finditer(segment):
+        k = m.start()
+        if escaped:
+            escaped = False
+            if k == i:
+                i = k + 1
+                continue
+        if m.group() == '\\':
+            escaped = in_string
+        else:
+            in_string = not in_string
+        i = k + 1
+
+    # An escape only carries over if the backslash was the last character
+    return in_string, escaped and i == len(segment)
+
+
+def _wants_words(record, words):
+    """Whether to keep original_sentences; with an id set, sentences whose id is unknown keep them."""
+    return words is True or (bool(words) and ('id' not in record or record['id'] in words))
+
+
+class _TranscriptReader:
+    """Incremental JSON scanner over a text file object."""
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping what has been consumed. Returns False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _ws(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def _peek(self):
+        if self.pos < len(self.buf) and self.buf[self.pos] not in ' \t\n\r':
+            return self.buf[self.pos]
+        self._ws()
+        if self.pos >= len(self.buf):
+            raise ValueError("Unexpected end of transcript")
+        return self.buf[self.pos]
+
+    def _expect(self, chars):
+        c = self._peek()
+        if c not in chars:
+            raise ValueError(f"Expected {chars!r} at offset {self.pos}, found {c!r}")
+        self.pos += 1
+        return c
+
+    def _value(self):
+        """Decode one complete JSON value with the C decoder, reading more as needed."""
+        self._ws()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number near the end of the buffer may continue in the next chunk
+            if len(self.buf) - end < _NUMBER_LOOKAHEAD and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip(self):
+        """Skip one value; arrays and objects are bracket-matched without decoding."""
+        opener = self._peek()
+        if opener not in _CLOSERS:
+            self._value()
+            return
+
+        # In valid JSON each bracket type balances on its own, so only the
+        # opener's type needs counting; e.g. word dicts inside arrays are passed over
+        closer = _CLOSERS[opener]
+        depth = 0
+        in_string = escaped = False
+        next_open = -1
+
+        while True:
+            # str.find is much faster than a regex character class here
+            buf = self.buf
+            if next_open < self.pos:
+                next_open = buf.find(opener, self.pos)
+            next_close = buf.find(closer, self.pos)
+            if next_close < 0 and next_open < 0:
+                in_string, escaped = _string_state(buf, self.pos, len(buf), in_string, escaped)
+                self.pos = len(buf)
+                next_open = -1
+                if not self._fill():
+                    raise ValueError("Unexpected end of transcript")
+                continue
+
+            is_open = next_close < 0 or 0 <= next_open < next_close
+            k = next_open if is_open else next_close
+            in_string, escaped = _string_state(buf, self.pos, k, in_string, escaped)
+            self.pos = k + 1
+            escaped = False
+            if in_string:
+                continue
+            depth += 1 if is_open else -1
+            if depth == 0:
+                return
+
+    def _header(self):
+        """
+        Fast path for the keys before original_sentences in the current sentence.
+
+        Slices the text up to the original_sentences key and decodes it in one
+        call. The key is only looked for before the first "}", which keeps the
+        search inside the current sentence; without it, the text up to that
+        "}" is tried as the whole (flat) sentence. Whenever a slice is not a
+        valid object, e.g. a "}" inside a string, the caller falls back to
+        key-by-key parsing.
+
+        Returns:
+            Tuple of (data or None, complete) where complete means the whole
+            sentence was consumed
+        """
+        end = self.buf.find('}', self.pos)
+        if end < 0 and self._fill():
+            end = self.buf.find('}', self.pos)
+        if end < 0:
+            return None, False
+
+        m = _WORDS_KEY.search(self.buf, self.pos, end)
+        if m is None:
+            try:
+                data = json.loads('{' + self.buf[self.pos:end + 1])
+            except ValueError:
+                return None, False
+            self.pos = end + 1
+            return data, True
+
+        head = self.buf[self.pos:m.start()].rstrip()
+        if not head.endswith(','):
+            return None, False
+        try:
+            data = json.loads('{' + head[:-1] + '}')
+        except ValueError:
+            return None, False
+
+        self.pos = m.end()
+        return data, False
+
+    def _sentence(self, fields, words):
+        self._expect('{')
+        record = {}
+        key = None
+
+        head, complete = self._header()
+        if complete:
+            return {
+                k: v for k, v in head.items()
+                if (_wants_words(head, words) if k == 'original_sentences' else fields is None or k in fields)
+            }
+        if head is not None:
+            record = head if fields is None else {k: v for k, v in head.items() if k in fields}
+            key = 'original_sentences'
+        elif self._peek() == '}':
+            self.pos += 1
+            return record
+
+        while True:
+            if key is None:
+                key = self._value()
+                self._expect(':')
+            if key == 'original_sentences':
+                wanted = _wants_words(record, words)
+            else:
+                wanted = fields is None or key in fields
+
+            if wanted:
+                record[key] = self._value()
+            else:
+                self._skip()
+
+            if self._expect(',}') == '}':
+                return record
+            key = None
+
+    def sentences(self, fields, words):
+        self._expect('{')
+        if self._peek() == '}':
+            return
+
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key != 'sentences':
+                self._skip()
+                if self._expect(',}') == '}':
+                    return
+                continue
+
+            # Nothing after the sentences array is needed
+            self._expect('[')
+            if self._peek() == ']':
+                return
+            while True:
+                yield self._sentence(fields, words)
+                if self._expect(',]') == ']':
+                    return
+
+
+def iter_sentences(path, fields=HEADER_FIELDS, words=False):
+    """
+    Yield sentences from a _v7.json file without loading the whole document.
+
+    Args:
+        path: Path to the _v7.json transcript
+        fields: Sentence keys to keep (None keeps every key except original_sentences)
+        words: True to include original_sentences (with word arrays) for every sentence,
+            or a set of sentence ids to include them for only those sentences
+
+    Yields:
+        Sentence dicts holding the requested keys that are present
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _TranscriptReader(f).sentences(fields, words)
@@ -0,0 +1,313 @@
+"""
+Local disk cache tier for videos hosted on the network share.
+
+When enabled, opening a video via /api/load starts a background fill that
+copies it block by block into a local cache directory. Range requests are
+served from cached blocks when present and fall back to the share
+otherwise. Whole videos are evicted least-recently-used first to stay
+within a byte budget; videos with a range request in flight are never
+evicted, and files that cannot be deleted yet keep counting against the
+budget until a later eviction pass removes them.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Cache directory; the cache is disabled when unset
+VIDEO_CACHE_DIR = os.environ.get('VIDEO_CACHE_DIR')
+
+# Total bytes the cache may occupy on local disk
+VIDEO_CACHE_MAX_BYTES = int(os.environ.get('VIDEO_CACHE_MAX_BYTES', 50 * 1024 ** 3))
+
+# Fill/lookup granularity
+VIDEO_CACHE_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class _CachedVideo:
+    """Cache state for one source video."""
+
+    __slots__ = ('source', 'size', 'mtime', 'path', 'blocks', 'cached_bytes',
+                 'last_access', 'filling', 'readers')
+
+    def __init__(self, source, size, mtime, path, block_count):
+        self.source = source
+        self.size = size
+        self.mtime = mtime
+        self.path = path
+        self.blocks = bytearray(block_count)
+        self.cached_bytes = 0
+        self.last_access = time.time()
+        self.filling = False
+        self.readers = 0
+
+    @property
+    def complete(self):
+        return all(self.blocks)
+
+
+class VideoCache:
+    """Block-level local cache of source videos with LRU eviction across videos."""
+
+    def __init__(self, cache_dir, max_bytes=VIDEO_CACHE_MAX_BYTES, block_size=VIDEO_CACHE_BLOCK_SIZE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self._videos = {}
+        # path -> bytes of evicted files whose deletion failed (e.g. still open on Windows)
+        self._orphans = {}
+        self._lock = threading.Lock()
+        self._hit_bytes = 0
+        self._miss_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    # ----- Index -----
+
+    def _key(self, source):
+        return hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()
+
+    def _block_count(self, size):
+        return (size + self.block_size - 1) // self.block_size
+
+    def _block_length(self, entry, block):
+        return min(self.block_size, entry.size - block * self.block_size)
+
+    def _load_index(self):
+        """Restore fully cached videos from a previous run; drop partial fills."""
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.json'):
+                continue
+            meta_path = path + '.json'
+            meta = None
+            if os.path.exists(meta_path):
+                try:
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                except (OSError, ValueError):
+                    meta = None
+
+            if not meta or os.path.getsize(path) != meta.get('size'):
+                self._remove_files(path)
+                continue
+
+            entry = _CachedVideo(meta['source'], meta['size'], meta['mtime'], path,
+                                 self._block_count(meta['size']))
+            entry.blocks = bytearray(b'\x01' * len(entry.blocks))
+            entry.cached_bytes = meta['size']
+            entry.last_access = meta.get('last_access', os.path.getmtime(path))
+            self._videos[meta['source']] = entry
+
+    def _write_meta(self, entry):
+        with open(entry.path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                "source": entry.source,
+                "size": entry.size,
+                "mtime": entry.mtime,
+                "last_access": entry.last_access
+            }, f)
+
+    def _remove_files(self, path):
+        """Delete a cached video and its metadata. Returns True if the data file is gone."""
+        for p in (path + '.json', path):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        return not os.path.exists(path)
+
+    def _entry(self, source, stat):
+        """
+        Get (or create) the cache entry for a source, invalidating stale copies. Caller holds the lock.
+
+        stat is the source's os.stat(), taken by the caller before locking so
+        share latency never blocks other readers.
+        """
+        entry = self._videos.get(source)
+        if entry and (entry.size != stat.st_size or entry.mtime != stat.st_mtime):
+            self._remove_files(entry.path)
+            entry = None
+
+        if entry is None:
+            path = os.path.join(self.cache_dir, self._key(source))
+            entry = _CachedVideo(source, stat.st_size, stat.st_mtime, path, self._block_count(stat.st_size))
+            self._remove_files(path)
+            # A new fill reuses the path, so its bytes are counted by this entry
+            self._orphans.pop(path, None)
+            self._videos[source] = entry
+
+        entry.last_access = time.time()
+        return entry
+
+    def _used_bytes(self):
+        return sum(e.cached_bytes for e in self._videos.values()) + sum(self._orphans.values())
+
+    def _reserve(self, entry, nbytes):
+        """Evict least recently used videos until nbytes fit. Caller holds the lock."""
+        # Retry files that could not be deleted on an earlier pass
+        for path in list(self._orphans):
+            if self._remove_files(path):
+                del self._orphans[path]
+
+        while self._used_bytes() + nbytes > self.max_bytes:
+            victims = [
+                e for e in self._videos.values()
+                if e is not entry and e.cached_bytes and not e.filling and not e.readers
+            ]
+            if not victims:
+                return False
+            victim = min(victims, key=lambda e: e.last_access)
+            del self._videos[victim.source]
+            if not self._remove_files(victim.path):
+                self._orphans[victim.path] = victim.cached_bytes
+        return True
+
+    # ----- Filling -----
+
+    def prefetch(self, source):
+        """Start filling a video into the cache in the background (no-op if already cached or filling)."""
+        stat = os.stat(source)
+        with self._lock:
+            entry = self._entry(source, stat)
+            if entry.filling or entry.complete:
+                return
+            entry.filling = True
+
+        thread = threading.Thread(target=self._fill, args=(entry,), daemon=True)
+        thread.start()
+
+    def _fill(self, entry):
+        try:
+            if not os.path.exists(entry.path):
+                with open(entry.path, 'wb') as f:
+                    f.truncate(entry.size)
+
+            with open(entry.source, 'rb') as src, open(entry.path, 'r+b') as dst:
+                for block in range(len(entry.blocks)):
+                    if entry.blocks[block]:
+                        continue
+                    length = self._block_length(entry, block)
+
+                    with self._lock:
+                        if self._videos.get(entry.source) is not entry:
+                            return  # Invalidated while filling
+                        if not self._reserve(entry, length):
+                            return  # Video does not fit in the budget
+
+                    src.seek(block * self.block_size)
+                    data = src.read(length)
+                    if len(data) != length:
+                        return
+                    dst.seek(block * self.block_size)
+                    dst.write(data)
+                    dst.flush()
+
+                    with self._lock:
+                        entry.blocks[block] = 1
+                        entry.cached_bytes += length
+
+            with self._lock:
+                if self._videos.get(entry.source) is entry and entry.complete:
+                    self._write_meta(entry)
+        except OSError:
+            pass
+        finally:
+            entry.filling = False
+
+    # ----- Reading -----
+
+    def iter_range(self, source, start, end, chunk_size=8192):
+        """
+        Yield bytes [start, end] of a video, preferring cached blocks.
+
+        Falls back to reading the source for blocks not yet cached. Known
+        videos are not re-stat'ed here; prefetch() (called from /api/load)
+        revalidates them against the share.
+        """
+        with self._lock:
+            entry = self._videos.get(source)
+            if entry:
+                entry.last_access = time.time()
+                entry.readers += 1
+        if entry is None:
+            stat = os.stat(source)
+            with self._lock:
+                entry = self._entry(source, stat)
+                entry.readers += 1
+
+        src = None
+        cached = None
+        try:
+            position = start
+            while position <= end:
+                block = position // self.block_size
+                block_end = min((block + 1) * self.block_size - 1, end)
+                length = block_end - position + 1
+
+                if entry.blocks[block] and cached is None:
+                    try:
+                        cached = open(entry.path, 'rb')
+                    except OSError:
+                        # Invalidated since the block was cached; serve from the share
+                        cached = False
+
+                if entry.blocks[block] and cached:
+                    f = cached
+                    hit = True
+                else:
+                    if src is None:
+                        src = open(source, 'rb')
+                    f = src
+                    hit = False
+
+                f.seek(position)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(chunk_size, remaining))
+                    if not chunk:
+                        return
+                    remaining -= len(chunk)
+                    yield chunk
+
+                with self._lock:
+                    if hit:
+                        self._hit_bytes += length
+                    else:
+                        self._miss_bytes += length
+                position = block_end + 1
+        finally:
+            if src:
+                src.close()
+            if cached:
+                cached.close()
+            with self._lock:
+                entry.readers -= 1
+
+    # ----- Stats -----
+
+    def stats(self):
+        """Cache occupancy and hit ratio (by bytes served)."""
+        with self._lock:
+            served = self._hit_bytes + self._miss_bytes
+            return {
+                "enabled": True,
+                "cache_dir": self.cache_dir,
+                "max_bytes": self.max_bytes,
+                "used_bytes": self._used_bytes(),
+                "video_count": len(self._videos),
+                "complete_videos": sum(1 for e in self._videos.values() if e.complete),
+                "filling": [e.source for e in self._videos.values() if e.filling],
+                "hit_bytes": self._hit_bytes,
+                "miss_bytes": self._miss_bytes,
+                "hit_ratio": round(self._hit_bytes / served, 4) if served else None
+            }
+
+
+def create_video_cache():
+    """Build the cache from configuration, or return None if no cache directory is set."""
+    if not VIDEO_CACHE_DIR:
+        return None
+    return VideoCache(VIDEO_CACHE_DIR)
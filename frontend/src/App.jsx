@@ -182,6 +182,27 @@ function App() {
     })
   }, [])
 
+  // Record a speaker decision and merge in the neighbouring suggestions it changed
+  const decideSpeakerSuggestion = useCallback((index, updates) => {
+    updateSpeakerSuggestion(index, updates)
+
+    const suggestion = speakerSuggestions[index]
+    if (!suggestion || !videoPath) return
+
+    fetch(`${API_BASE}/speaker-decision`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ video_path: videoPath, sentence_id: suggestion.sentence_id, ...updates })
+    })
+      .then(res => res.json())
+      .then(data => {
+        if (!data.changed) return
+        const changedById = new Map(data.changed.map(s => [s.sentence_id, s]))
+        setSpeakerSuggestions(prev => prev.map(s => changedById.get(s.sentence_id) || s))
+      })
+      .catch(err => console.error('Speaker decision error:', err))
+  }, [speakerSuggestions, videoPath, updateSpeakerSuggestion])
+
   // Correction action handlers
   const handleAccept = useCallback(() => {
     if (reviewPhase !== 'corrections' || !currentItem) return
@@ -235,7 +256,7 @@ function App() {
   const handleMergeBefore = useCallback(() => {
     if (reviewPhase !== 'speakers' || !currentItem || !currentItem.prev_speaker) return
 
-    updateSpeakerSuggestion(currentIndex, {
+    decideSpeakerSuggestion(currentIndex, {
       status: 'decided',
       decision: 'merge_before',
       assigned_speaker: currentItem.prev_speaker
@@ -244,12 +265,12 @@ function App() {
     if (currentIndex < speakerSuggestions.length - 1) {
       setCurrentIndex(currentIndex + 1)
     }
-  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, updateSpeakerSuggestion])
+  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, decideSpeakerSuggestion])
 
   const handleMergeAfter = useCallback(() => {
     if (reviewPhase !== 'speakers' || !currentItem || !currentItem.next_speaker) return
 
-    updateSpeakerSuggestion(currentIndex, {
+    decideSpeakerSuggestion(currentIndex, {
       status: 'decided',
       decision: 'merge_after',
       assigned_speaker: currentItem.next_speaker
@@ -258,12 +279,12 @@ function App() {
     if (currentIndex < speakerSuggestions.length - 1) {
       setCurrentIndex(currentIndex + 1)
     }
-  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, updateSpeakerSuggestion])
+  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, decideSpeakerSuggestion])
 
   const handleKeepSeparate = useCallback(() => {
     if (reviewPhase !== 'speakers' || !currentItem) return
 
-    updateSpeakerSuggestion(currentIndex, {
+    decideSpeakerSuggestion(currentIndex, {
       status: 'decided',
       decision: 'keep_separate',
       assigned_speaker: currentItem.current_speaker
@@ -272,7 +293,7 @@ function App() {
     if (currentIndex < speakerSuggestions.length - 1) {
       setCurrentIndex(currentIndex + 1)
     }
-  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, updateSpeakerSuggestion])
+  }, [reviewPhase, currentItem, currentIndex, speakerSuggestions.length, decideSpeakerSuggestion])
 
   const handleAssignSpeaker = useCallback(() => {
     if (reviewPhase !== 'speakers') return
@@ -280,7 +301,7 @@ function App() {
   }, [reviewPhase])
 
   const handleSpeakerAssignConfirm = useCallback((speaker) => {
-    updateSpeakerSuggestion(currentIndex, {
+    decideSpeakerSuggestion(currentIndex, {
       status: 'decided',
       decision: 'assign',
       assigned_speaker: speaker
@@ -300,7 +321,7 @@ function App() {
     if (currentIndex < speakerSuggestions.length - 1) {
       setCurrentIndex(currentIndex + 1)
     }
-  }, [currentIndex, speakerSuggestions.length, knownSpeakers, speakerNames, updateSpeakerSuggestion])
+  }, [currentIndex, speakerSuggestions.length, knownSpeakers, speakerNames, decideSpeakerSuggestion])
 
   // Navigation handlers
   const handleNext = useCallback(() => {
@@ -34,18 +34,33 @@ function FileBrowser({ onSelectVideo, loading, error }) {
     }
   }
 
-  // Search for videos with corrections
+  // Search for videos with corrections (runs as a background scan job)
   const searchForVideos = async () => {
     setSearching(true)
     try {
-      const response = await fetch(`${API_BASE}/browse?path=${encodeURIComponent(currentPath)}`)
-      const data = await response.json()
+      const response = await fetch(`${API_BASE}/jobs`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ kind: 'scan', params: { path: currentPath } })
+      })
+      let job = await response.json()
+
+      if (job.error) {
+        throw new Error(job.error)
+      }
 
-      if (data.error) {
-        throw new Error(data.error)
+      // Poll until the scan finishes
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 500))
+        const pollResponse = await fetch(`${API_BASE}/jobs/${job.id}`)
+        job = await pollResponse.json()
+      }
+
+      if (job.status !== 'completed') {
+        throw new Error(job.error || `Scan ${job.status}`)
       }
 
-      setSearchResults(data.files)
+      setSearchResults(job.result.files)
     } catch (err) {
       console.error('Search error:', err)
     } finally {